@@ -14,78 +14,130 @@ The tests follow Test-Driven Development (TDD) methodology and include:
 - Error handling tests (404, 409, etc.)
 - Keywords integration tests
 """
+import json
+from functools import lru_cache
+
 import pytest
 from httpx import AsyncClient
-from unittest.mock import MagicMock
+from fastapi.testclient import TestClient
+from types import SimpleNamespace
+from typing import NamedTuple
 from datetime import datetime
 
+import dependencies
+from app.api.v1.endpoints import notify_settings
 from core.security import create_access_token
 
 
 # --- Test Data Constants ---
 
-ACTIVE_USER_MOCK = MagicMock(
+# One shared timestamp instance for every created_at/updated_at field
+FIXED_DATETIME = datetime(2024, 1, 1, 0, 0, 0)
+
+# Plain attribute record: the endpoints only read user fields, so a
+# SimpleNamespace avoids MagicMock minting child mocks on every access
+ACTIVE_USER_MOCK = SimpleNamespace(
     id=1,
     username="user@example.com",
     password_hash="hashed_password",
     invite_code_used="TESTCODE",
     is_active=True,
-    created_at=datetime(2024, 1, 1, 0, 0, 0),
-    updated_at=datetime(2024, 1, 1, 0, 0, 0)
+    created_at=FIXED_DATETIME,
+    updated_at=FIXED_DATETIME
 )
 
-EMAIL_NOTIFY_SETTING_MOCK = MagicMock(
-    id=1,
-    user_id=1,
-    notify_type="email",
-    email_address="user@example.com",
-    is_active=True,
-    created_at=datetime(2024, 1, 1, 0, 0, 0),
-    updated_at=datetime(2024, 1, 1, 0, 0, 0)
-)
+class KeywordRecord(NamedTuple):
+    """Lightweight stand-in for a Keyword row; the endpoints only read .keyword"""
+    keyword: str
+
+
+def make_setting(**overrides) -> SimpleNamespace:
+    """Helper function to build a plain notify-setting record (email by default) with field overrides"""
+    fields = {
+        "id": 1,
+        "user_id": 1,
+        "notify_type": "email",
+        "email_address": "user@example.com",
+        "is_active": True,
+        "created_at": FIXED_DATETIME,
+        "updated_at": FIXED_DATETIME,
+    }
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+# Shared read-only record; tests needing different field values build their own via make_setting()
+EMAIL_NOTIFY_SETTING_MOCK = make_setting()
 
-TELEGRAM_NOTIFY_SETTING_MOCK = MagicMock(
-    id=2,
-    user_id=1,
-    notify_type="telegram",
-    email_address=None,
-    is_active=True,
-    created_at=datetime(2024, 1, 1, 0, 0, 0),
-    updated_at=datetime(2024, 1, 1, 0, 0, 0)
-)
+
+def returns(value):
+    """Helper function to build a stub that ignores its arguments and returns value"""
+    return lambda *args, **kwargs: value
+
+
+# Memoized signer so each distinct username is only signed once per module
+_cached_token = lru_cache(maxsize=8)(create_access_token)
+
+
+def status_and_detail(response) -> tuple:
+    """Helper function to read the status code and error detail, parsing the JSON body only once"""
+    return response.status_code, response.json().get("detail")
 
 
 def get_auth_headers(username: str = "user@example.com") -> dict:
     """Helper function to get authorization headers with JWT token"""
-    token = create_access_token(subject=username)
+    token = _cached_token(subject=username)
     return {"Authorization": f"Bearer {token}"}
 
 
+# Signed once at import time; the token is valid far longer than a test run
+AUTH_HEADERS = get_auth_headers()
+JSON_HEADERS = {"Content-Type": "application/json"}
+JSON_AUTH_HEADERS = {**AUTH_HEADERS, **JSON_HEADERS}
+
+
+@pytest.fixture(autouse=True)
+def authenticated_user(set_attrs):
+    """Resolve the JWT subject to ACTIVE_USER_MOCK for every test; tests only stub their CRUD calls"""
+    set_attrs(dependencies.crud_user, get_user_by_username=returns(ACTIVE_USER_MOCK))
+
+
+# --- Pre-serialized Request Bodies (sent with content= to skip per-request json.dumps) ---
+
+CREATE_EMAIL_WITH_KEYWORDS_BODY = json.dumps({
+    "notify_type": "email",
+    "email_address": "user@example.com",
+    "keywords": ["keyword1", "keyword2"]
+}).encode()
+CREATE_EMAIL_BODY = json.dumps({"notify_type": "email", "email_address": "user@example.com"}).encode()
+EMAIL_TYPE_ONLY_BODY = json.dumps({"notify_type": "email"}).encode()
+UPDATE_EMAIL_BODY = json.dumps({"email_address": "newemail@example.com"}).encode()
+UPDATE_KEYWORDS_BODY = json.dumps({"keywords": ["new1", "new2"]}).encode()
+CLEAR_KEYWORDS_BODY = json.dumps({"keywords": []}).encode()
+
+
 # --- Tests for POST /api/v1/me/notify-settings/ (Create) ---
 
 class TestCreateNotifySetting:
     """Test cases for creating notification settings using Singleton Resource pattern"""
     
-    @pytest.mark.asyncio
-    async def test_create_email_notify_setting_with_valid_data_should_succeed(self, async_client: AsyncClient, mocker):
+    async def test_create_email_notify_setting_with_valid_data_should_succeed(self, async_client: AsyncClient, set_attrs):
         """
         Test NST-001: Creating email notification setting with valid email should succeed (200 OK)
         """
         # Arrange
-        mocker.patch("dependencies.crud_user.get_user_by_username", return_value=ACTIVE_USER_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.get_by_owner", return_value=None)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.create_with_owner", return_value=EMAIL_NOTIFY_SETTING_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.get_by_user_id", return_value=[])
+        set_attrs(
+            notify_settings.crud_notify_setting,
+            get_by_owner=returns(None),
+            create_with_owner=returns(EMAIL_NOTIFY_SETTING_MOCK),
+        )
+        set_attrs(notify_settings, get_by_user_id=returns([]))
         
         # Act
         response = await async_client.post(
             "/api/v1/me/notify-settings/",
-            json={
-                "notify_type": "email", 
-                "email_address": "user@example.com",
-                "keywords": ["keyword1", "keyword2"]
-            },
-            headers=get_auth_headers()
+            content=CREATE_EMAIL_WITH_KEYWORDS_BODY,
+            headers=JSON_AUTH_HEADERS
         )
         
         # Assert
@@ -98,39 +150,32 @@ class TestCreateNotifySetting:
         assert "keywords" in data["data"]
         assert isinstance(data["data"]["keywords"], list)
 
-    @pytest.mark.asyncio
-    async def test_create_notify_setting_when_already_exists_should_return_409_conflict(self, async_client: AsyncClient, mocker):
+    async def test_create_notify_setting_when_already_exists_should_return_409_conflict(self, async_client: AsyncClient, set_attrs):
         """
         Test NST-002: Creating notification setting when one already exists should return 409 Conflict
         """
         # Arrange
-        mocker.patch("dependencies.crud_user.get_user_by_username", return_value=ACTIVE_USER_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.get_by_owner", return_value=EMAIL_NOTIFY_SETTING_MOCK)
+        set_attrs(notify_settings.crud_notify_setting, get_by_owner=returns(EMAIL_NOTIFY_SETTING_MOCK))
         
         # Act
         response = await async_client.post(
             "/api/v1/me/notify-settings/",
-            json={"notify_type": "email", "email_address": "user@example.com"},
-            headers=get_auth_headers()
+            content=CREATE_EMAIL_BODY,
+            headers=JSON_AUTH_HEADERS
         )
         
         # Assert
-        assert response.status_code == 409
-        assert response.json()["detail"] == "Notify setting already exists for this user."
+        assert status_and_detail(response) == (409, "Notify setting already exists for this user.")
 
-    @pytest.mark.asyncio
-    async def test_create_email_notify_setting_without_email_should_fail(self, async_client: AsyncClient, mocker):
+    def test_create_email_notify_setting_without_email_should_fail(self, sync_client: TestClient):
         """
         Test NST-003: Creating email notification without email address should fail with validation error
         """
-        # Arrange
-        mocker.patch("dependencies.crud_user.get_user_by_username", return_value=ACTIVE_USER_MOCK)
-        
         # Act
-        response = await async_client.post(
+        response = sync_client.post(
             "/api/v1/me/notify-settings/",
-            json={"notify_type": "email"},
-            headers=get_auth_headers()
+            content=EMAIL_TYPE_ONLY_BODY,
+            headers=JSON_AUTH_HEADERS
         )
         
         # Assert
@@ -139,38 +184,22 @@ class TestCreateNotifySetting:
         assert response_data["success"] is False
         assert "參數驗證失敗" in response_data["message"]
 
-    @pytest.mark.asyncio
-    async def test_create_notify_setting_without_token_should_return_401_unauthorized(self, async_client: AsyncClient):
-        """
-        Test NST-004: Creating notification setting without JWT token should return 401 Unauthorized
-        """
-        # Act
-        response = await async_client.post(
-            "/api/v1/me/notify-settings/",
-            json={"notify_type": "email", "email_address": "user@example.com"}
-        )
-        
-        # Assert
-        assert response.status_code == 401
-
 
 # --- Tests for GET /api/v1/me/notify-settings/ (Read) ---
 
 class TestReadNotifySetting:
     """Test cases for reading notification settings using Singleton Resource pattern"""
     
-    @pytest.mark.asyncio
-    async def test_get_existing_notify_setting_should_succeed(self, async_client: AsyncClient, mocker):
+    async def test_get_existing_notify_setting_should_succeed(self, async_client: AsyncClient, set_attrs):
         """
         Test NST-005: Getting existing notification setting should return setting data
         """
         # Arrange
-        mocker.patch("dependencies.crud_user.get_user_by_username", return_value=ACTIVE_USER_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.get_by_owner", return_value=EMAIL_NOTIFY_SETTING_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.get_by_user_id", return_value=[])
+        set_attrs(notify_settings.crud_notify_setting, get_by_owner=returns(EMAIL_NOTIFY_SETTING_MOCK))
+        set_attrs(notify_settings, get_by_user_id=returns([]))
         
         # Act
-        response = await async_client.get("/api/v1/me/notify-settings/", headers=get_auth_headers())
+        response = await async_client.get("/api/v1/me/notify-settings/", headers=AUTH_HEADERS)
         
         # Assert
         assert response.status_code == 200
@@ -180,59 +209,32 @@ class TestReadNotifySetting:
         assert data["data"]["email_address"] == "user@example.com"
         assert "keywords" in data["data"]
 
-    @pytest.mark.asyncio
-    async def test_get_nonexistent_notify_setting_should_return_404_not_found(self, async_client: AsyncClient, mocker):
-        """
-        Test NST-006: Getting non-existent notification setting should return 404 Not Found
-        """
-        # Arrange
-        mocker.patch("dependencies.crud_user.get_user_by_username", return_value=ACTIVE_USER_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.get_by_owner", return_value=None)
-        
-        # Act
-        response = await async_client.get("/api/v1/me/notify-settings/", headers=get_auth_headers())
-        
-        # Assert
-        assert response.status_code == 404
-        assert response.json()["detail"] == "找不到通知設定"
-
-    @pytest.mark.asyncio
-    async def test_get_notify_setting_without_token_should_return_401_unauthorized(self, async_client: AsyncClient):
-        """
-        Test NST-007: Getting notification setting without JWT token should return 401 Unauthorized
-        """
-        # Act
-        response = await async_client.get("/api/v1/me/notify-settings/")
-        
-        # Assert
-        assert response.status_code == 401
-
 
 # --- Tests for PUT /api/v1/me/notify-settings/ (Update) ---
 
 class TestUpdateNotifySetting:
     """Test cases for updating notification settings using Singleton Resource pattern"""
     
-    @pytest.mark.asyncio
-    async def test_update_existing_notify_setting_should_succeed(self, async_client: AsyncClient, mocker):
+    async def test_update_existing_notify_setting_should_succeed(self, async_client: AsyncClient, set_attrs):
         """
         Test NST-008: Updating existing notification setting with valid data should succeed
         """
         # Arrange
-        updated_setting = MagicMock(**EMAIL_NOTIFY_SETTING_MOCK.__dict__)
-        updated_setting.email_address = "newemail@example.com"
+        updated_setting = make_setting(email_address="newemail@example.com")
         
-        mocker.patch("dependencies.crud_user.get_user_by_username", return_value=ACTIVE_USER_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.get_by_owner", return_value=EMAIL_NOTIFY_SETTING_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.validate_final_state", return_value=True)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.update", return_value=updated_setting)
-        mocker.patch("app.api.v1.endpoints.notify_settings.get_by_user_id", return_value=[])
+        set_attrs(
+            notify_settings.crud_notify_setting,
+            get_by_owner=returns(EMAIL_NOTIFY_SETTING_MOCK),
+            validate_final_state=returns(True),
+            update=returns(updated_setting),
+        )
+        set_attrs(notify_settings, get_by_user_id=returns([]))
         
         # Act
         response = await async_client.put(
             "/api/v1/me/notify-settings/",
-            json={"email_address": "newemail@example.com"},
-            headers=get_auth_headers()
+            content=UPDATE_EMAIL_BODY,
+            headers=JSON_AUTH_HEADERS
         )
         
         # Assert
@@ -241,72 +243,52 @@ class TestUpdateNotifySetting:
         assert data["success"] is True
         assert data["data"]["email_address"] == "newemail@example.com"
 
-    @pytest.mark.asyncio
-    async def test_update_nonexistent_notify_setting_should_return_404_not_found(self, async_client: AsyncClient, mocker):
-        """
-        Test NST-009: Updating non-existent notification setting should return 404 Not Found
-        """
-        # Arrange
-        mocker.patch("dependencies.crud_user.get_user_by_username", return_value=ACTIVE_USER_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.get_by_owner", return_value=None)
-        
-        # Act
-        response = await async_client.put(
-            "/api/v1/me/notify-settings/",
-            json={"email_address": "newemail@example.com"},
-            headers=get_auth_headers()
-        )
-        
-        # Assert
-        assert response.status_code == 404
-        assert response.json()["detail"] == "找不到通知設定"
-
-    @pytest.mark.asyncio
-    async def test_update_to_invalid_email_state_should_fail(self, async_client: AsyncClient, mocker):
+    async def test_update_to_invalid_email_state_should_fail(self, async_client: AsyncClient, set_attrs):
         """
         Test NST-010: Updating to invalid email state should fail with validation error
         """
         # Arrange
-        setting_without_email = MagicMock(**TELEGRAM_NOTIFY_SETTING_MOCK.__dict__)
+        setting_without_email = make_setting(id=2, notify_type="telegram", email_address=None)
         
-        mocker.patch("dependencies.crud_user.get_user_by_username", return_value=ACTIVE_USER_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.get_by_owner", return_value=setting_without_email)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.validate_final_state", return_value=False)
+        set_attrs(
+            notify_settings.crud_notify_setting,
+            get_by_owner=returns(setting_without_email),
+            validate_final_state=returns(False),
+        )
         
         # Act
         response = await async_client.put(
             "/api/v1/me/notify-settings/",
-            json={"notify_type": "email"},
-            headers=get_auth_headers()
+            content=EMAIL_TYPE_ONLY_BODY,
+            headers=JSON_AUTH_HEADERS
         )
         
         # Assert
-        assert response.status_code == 400
-        assert response.json()["detail"] == "Email 通知類型必須提供有效的 Email 地址"
+        assert status_and_detail(response) == (400, "Email 通知類型必須提供有效的 Email 地址")
 
-    @pytest.mark.asyncio
-    async def test_update_notify_setting_with_keywords_should_succeed(self, async_client: AsyncClient, mocker):
+    async def test_update_notify_setting_with_keywords_should_succeed(self, async_client: AsyncClient, set_attrs):
         """
         Test NST-011: Updating notification setting with keywords should succeed
         """
         # Arrange
-        updated_setting = MagicMock(**EMAIL_NOTIFY_SETTING_MOCK.__dict__)
         new_keyword_mocks = [
-            MagicMock(keyword="new1"),
-            MagicMock(keyword="new2")
+            KeywordRecord("new1"),
+            KeywordRecord("new2")
         ]
         
-        mocker.patch("dependencies.crud_user.get_user_by_username", return_value=ACTIVE_USER_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.get_by_owner", return_value=EMAIL_NOTIFY_SETTING_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.validate_final_state", return_value=True)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.update", return_value=updated_setting)
-        mocker.patch("app.api.v1.endpoints.notify_settings.get_by_user_id", return_value=new_keyword_mocks)
+        set_attrs(
+            notify_settings.crud_notify_setting,
+            get_by_owner=returns(EMAIL_NOTIFY_SETTING_MOCK),
+            validate_final_state=returns(True),
+            update=returns(EMAIL_NOTIFY_SETTING_MOCK),
+        )
+        set_attrs(notify_settings, get_by_user_id=returns(new_keyword_mocks))
         
         # Act
         response = await async_client.put(
             "/api/v1/me/notify-settings/",
-            json={"keywords": ["new1", "new2"]},
-            headers=get_auth_headers()
+            content=UPDATE_KEYWORDS_BODY,
+            headers=JSON_AUTH_HEADERS
         )
         
         # Assert
@@ -322,47 +304,77 @@ class TestUpdateNotifySetting:
 class TestDeleteNotifySetting:
     """Test cases for deleting notification settings using Singleton Resource pattern"""
     
-    @pytest.mark.asyncio
-    async def test_delete_existing_notify_setting_should_return_204_no_content(self, async_client: AsyncClient, mocker):
+    async def test_delete_existing_notify_setting_should_return_204_no_content(self, async_client: AsyncClient, set_attrs):
         """
         Test NST-012: Deleting existing notification setting should return 204 No Content
         """
         # Arrange
-        mocker.patch("dependencies.crud_user.get_user_by_username", return_value=ACTIVE_USER_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.get_by_owner", return_value=EMAIL_NOTIFY_SETTING_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.remove_by_owner", return_value=True)
+        set_attrs(
+            notify_settings.crud_notify_setting,
+            get_by_owner=returns(EMAIL_NOTIFY_SETTING_MOCK),
+            remove_by_owner=returns(True),
+        )
         
         # Act
-        response = await async_client.delete("/api/v1/me/notify-settings/", headers=get_auth_headers())
+        response = await async_client.delete("/api/v1/me/notify-settings/", headers=AUTH_HEADERS)
         
         # Assert
         assert response.status_code == 204
         # 204 No Content should have empty body
         assert response.content == b""
 
-    @pytest.mark.asyncio
-    async def test_delete_nonexistent_notify_setting_should_return_404_not_found(self, async_client: AsyncClient, mocker):
+
+# --- Tests for missing settings (all methods) ---
+
+class TestNotifySettingNotFound:
+    """Test cases for reading, updating or deleting when the user has no notification setting"""
+
+    @pytest.mark.parametrize("method, body", [
+        ("GET", None),                # NST-006
+        ("PUT", UPDATE_EMAIL_BODY),   # NST-009
+        ("DELETE", None),             # NST-013
+    ], ids=["GET", "PUT", "DELETE"])
+    def test_nonexistent_notify_setting_should_return_404_not_found(self, sync_client: TestClient, set_attrs, method, body):
         """
-        Test NST-013: Deleting non-existent notification setting should return 404 Not Found
+        Test NST-006/009/013: Reading, updating or deleting a non-existent notification setting should return 404 Not Found
         """
         # Arrange
-        mocker.patch("dependencies.crud_user.get_user_by_username", return_value=ACTIVE_USER_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.get_by_owner", return_value=None)
+        set_attrs(notify_settings.crud_notify_setting, get_by_owner=returns(None))
         
         # Act
-        response = await async_client.delete("/api/v1/me/notify-settings/", headers=get_auth_headers())
+        response = sync_client.request(
+            method,
+            "/api/v1/me/notify-settings/",
+            content=body,
+            headers=JSON_AUTH_HEADERS if body else AUTH_HEADERS
+        )
         
         # Assert
-        assert response.status_code == 404
-        assert response.json()["detail"] == "找不到通知設定"
+        assert status_and_detail(response) == (404, "找不到通知設定")
+
+
+# --- Tests for Authorization (all methods) ---
+
+class TestNotifySettingWithoutToken:
+    """Test cases for calling the notification settings endpoints without a JWT token"""
 
-    @pytest.mark.asyncio
-    async def test_delete_notify_setting_without_token_should_return_401_unauthorized(self, async_client: AsyncClient):
+    @pytest.mark.parametrize("method, body", [
+        ("POST", CREATE_EMAIL_BODY),  # NST-004
+        ("GET", None),                # NST-007
+        ("PUT", UPDATE_EMAIL_BODY),
+        ("DELETE", None),             # NST-014
+    ], ids=["POST", "GET", "PUT", "DELETE"])
+    def test_notify_setting_without_token_should_return_401_unauthorized(self, sync_client: TestClient, method, body):
         """
-        Test NST-014: Deleting notification setting without JWT token should return 401 Unauthorized
+        Test NST-004/007/014: Calling any notification setting method without JWT token should return 401 Unauthorized
         """
         # Act
-        response = await async_client.delete("/api/v1/me/notify-settings/")
+        response = sync_client.request(
+            method,
+            "/api/v1/me/notify-settings/",
+            content=body,
+            headers=JSON_HEADERS if body else None
+        )
         
         # Assert
         assert response.status_code == 401
@@ -373,31 +385,28 @@ class TestDeleteNotifySetting:
 class TestNotifySettingsWithKeywords:
     """Test cases for notification settings with keywords integration in Singleton Resource pattern"""
     
-    @pytest.mark.asyncio
-    async def test_create_notify_setting_with_keywords_should_succeed(self, async_client: AsyncClient, mocker):
+    async def test_create_notify_setting_with_keywords_should_succeed(self, async_client: AsyncClient, set_attrs):
         """
         Test NST-015: Creating notification setting with keywords should succeed
         """
         # Arrange
         keyword_mocks = [
-            MagicMock(keyword="keyword1"),
-            MagicMock(keyword="keyword2")
+            KeywordRecord("keyword1"),
+            KeywordRecord("keyword2")
         ]
         
-        mocker.patch("dependencies.crud_user.get_user_by_username", return_value=ACTIVE_USER_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.get_by_owner", return_value=None)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.create_with_owner", return_value=EMAIL_NOTIFY_SETTING_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.get_by_user_id", return_value=keyword_mocks)
+        set_attrs(
+            notify_settings.crud_notify_setting,
+            get_by_owner=returns(None),
+            create_with_owner=returns(EMAIL_NOTIFY_SETTING_MOCK),
+        )
+        set_attrs(notify_settings, get_by_user_id=returns(keyword_mocks))
         
         # Act
         response = await async_client.post(
             "/api/v1/me/notify-settings/",
-            json={
-                "notify_type": "email",
-                "email_address": "user@example.com",
-                "keywords": ["keyword1", "keyword2"]
-            },
-            headers=get_auth_headers()
+            content=CREATE_EMAIL_WITH_KEYWORDS_BODY,
+            headers=JSON_AUTH_HEADERS
         )
         
         # Assert
@@ -407,23 +416,21 @@ class TestNotifySettingsWithKeywords:
         assert "keywords" in data["data"]
         assert data["data"]["keywords"] == ["keyword1", "keyword2"]
 
-    @pytest.mark.asyncio
-    async def test_get_notify_setting_should_include_keywords(self, async_client: AsyncClient, mocker):
+    async def test_get_notify_setting_should_include_keywords(self, async_client: AsyncClient, set_attrs):
         """
         Test NST-016: GET notify-setting should include user's keywords
         """
         # Arrange
         keyword_mocks = [
-            MagicMock(keyword="Python"),
-            MagicMock(keyword="FastAPI")
+            KeywordRecord("Python"),
+            KeywordRecord("FastAPI")
         ]
         
-        mocker.patch("dependencies.crud_user.get_user_by_username", return_value=ACTIVE_USER_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.get_by_owner", return_value=EMAIL_NOTIFY_SETTING_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.get_by_user_id", return_value=keyword_mocks)
+        set_attrs(notify_settings.crud_notify_setting, get_by_owner=returns(EMAIL_NOTIFY_SETTING_MOCK))
+        set_attrs(notify_settings, get_by_user_id=returns(keyword_mocks))
         
         # Act
-        response = await async_client.get("/api/v1/me/notify-settings/", headers=get_auth_headers())
+        response = await async_client.get("/api/v1/me/notify-settings/", headers=AUTH_HEADERS)
         
         # Assert
         assert response.status_code == 200
@@ -432,18 +439,16 @@ class TestNotifySettingsWithKeywords:
         assert "keywords" in data["data"]
         assert data["data"]["keywords"] == ["Python", "FastAPI"]
 
-    @pytest.mark.asyncio
-    async def test_get_notify_setting_with_no_keywords_should_include_empty_keywords(self, async_client: AsyncClient, mocker):
+    async def test_get_notify_setting_with_no_keywords_should_include_empty_keywords(self, async_client: AsyncClient, set_attrs):
         """
         Test NST-017: GET notify-setting should include empty keywords list for users with no keywords
         """
         # Arrange
-        mocker.patch("dependencies.crud_user.get_user_by_username", return_value=ACTIVE_USER_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.get_by_owner", return_value=EMAIL_NOTIFY_SETTING_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.get_by_user_id", return_value=[])
+        set_attrs(notify_settings.crud_notify_setting, get_by_owner=returns(EMAIL_NOTIFY_SETTING_MOCK))
+        set_attrs(notify_settings, get_by_user_id=returns([]))
         
         # Act
-        response = await async_client.get("/api/v1/me/notify-settings/", headers=get_auth_headers())
+        response = await async_client.get("/api/v1/me/notify-settings/", headers=AUTH_HEADERS)
         
         # Assert
         assert response.status_code == 200
@@ -452,25 +457,24 @@ class TestNotifySettingsWithKeywords:
         assert "keywords" in data["data"]
         assert data["data"]["keywords"] == []
 
-    @pytest.mark.asyncio
-    async def test_update_notify_setting_clear_keywords_with_empty_array_should_succeed(self, async_client: AsyncClient, mocker):
+    async def test_update_notify_setting_clear_keywords_with_empty_array_should_succeed(self, async_client: AsyncClient, set_attrs):
         """
         Test NST-018: Updating notification setting to clear all keywords with empty array should succeed
         """
         # Arrange
-        updated_setting = MagicMock(**EMAIL_NOTIFY_SETTING_MOCK.__dict__)
-        
-        mocker.patch("dependencies.crud_user.get_user_by_username", return_value=ACTIVE_USER_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.get_by_owner", return_value=EMAIL_NOTIFY_SETTING_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.validate_final_state", return_value=True)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.update", return_value=updated_setting)
-        mocker.patch("app.api.v1.endpoints.notify_settings.get_by_user_id", return_value=[])
+        set_attrs(
+            notify_settings.crud_notify_setting,
+            get_by_owner=returns(EMAIL_NOTIFY_SETTING_MOCK),
+            validate_final_state=returns(True),
+            update=returns(EMAIL_NOTIFY_SETTING_MOCK),
+        )
+        set_attrs(notify_settings, get_by_user_id=returns([]))
         
         # Act
         response = await async_client.put(
             "/api/v1/me/notify-settings/",
-            json={"keywords": []},
-            headers=get_auth_headers()
+            content=CLEAR_KEYWORDS_BODY,
+            headers=JSON_AUTH_HEADERS
         )
         
         # Assert
@@ -1,27 +1,180 @@
-import sys
-import os
 import pytest
-from typing import AsyncGenerator
+from datetime import datetime, timezone
+from functools import partial
+from types import SimpleNamespace
+from typing import AsyncGenerator, Callable, Generator
 from httpx import AsyncClient, ASGITransport
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
 
-# Add the project root directory to the Python path
-# This allows pytest to find the 'app' module
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from app.main import app
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    """
+    Pause coverage tracing for tests in modules that set NO_COVER = True.
+    pytest-cov's no_cover marker is added here instead of through a module-level
+    pytestmark because the marker errors out when coverage is disabled with --no-cov.
+    """
+    if config.getoption("no_cov", default=True):
+        return
+    for item in items:
+        if getattr(getattr(item, "module", None), "NO_COVER", False):
+            item.add_marker(pytest.mark.no_cover)
+
+
+@pytest.fixture(scope="session")
+def app() -> FastAPI:
+    """
+    A fixture that provides the FastAPI application, built once per session.
+    The import is deferred to here so collection (e.g. with -k) does not
+    build the whole app for tests that never use a client.
+    Its startup/shutdown handlers are never run: neither client below sends
+    lifespan events, so database init and the scheduler stay out of the tests.
+    """
+    from app.main import app as fastapi_app
+
+    return fastapi_app
 
 
-@pytest.fixture(scope="function")
-async def async_client() -> AsyncGenerator[AsyncClient, None]:
+@pytest.fixture(scope="session")
+async def async_client(app: FastAPI) -> AsyncGenerator[AsyncClient, None]:
     """
     A fixture that provides an asynchronous test client for the API.
     This client can be used to make requests to the application in tests.
-    The scope is 'function' to ensure a clean client for each test.
+    The scope is 'session' so a single client (and transport) is shared by
+    every test; per-test isolation comes from the function-scoped 'mocker'.
+    Fixtures and tests share one session event loop (see pytest.ini).
     """
-    # Use ASGITransport to wrap the FastAPI app
+    # Use ASGITransport to wrap the FastAPI app.
+    # ASGITransport only forwards HTTP scopes and never sends lifespan events,
+    # so the app's startup/shutdown handlers (database init, scheduler) are
+    # intentionally skipped; the tests mock every dependency they touch.
     transport = ASGITransport(app=app)
     
     # Use httpx.AsyncClient with the ASGI transport
     async with AsyncClient(transport=transport, base_url="http://test") as client:
-        # Yield the client to the test function
+        # Yield the client to the test function for the whole session
         yield client
+
+
+@pytest.fixture(scope="session")
+def sync_client(app: FastAPI) -> Generator[TestClient, None, None]:
+    """
+    A fixture that provides a synchronous Starlette test client for the API.
+    Trivial tests (auth/validation/404 paths) use it to skip the async test
+    machinery. It is not entered as a context manager, so lifespan events
+    are not run, matching async_client.
+    """
+    client = TestClient(app, base_url="http://test")
+    yield client
+    client.close()
+
+
+@pytest.fixture(scope="session")
+def access_token() -> str:
+    """
+    A JWT access token for user id 1, signed once per session.
+    The token outlives any test run.
+    """
+    from core.security import create_access_token
+
+    return create_access_token(subject='1')
+
+
+@pytest.fixture(scope="session")
+def auth_headers(access_token: str) -> dict:
+    """
+    Authorization headers carrying access_token; treat the dict as read-only.
+    """
+    return {"Authorization": f"Bearer {access_token}"}
+
+
+@pytest.fixture
+def set_attrs(monkeypatch):
+    """
+    A fixture that assigns attributes directly on already-imported objects
+    (e.g. set_attrs(crud_module, get_by_owner=stub)), avoiding the dotted-path
+    resolution and MagicMock construction of mocker.patch. The original
+    attributes are restored by monkeypatch when the test finishes.
+    """
+    def _set_attrs(target, **attrs):
+        for name, value in attrs.items():
+            monkeypatch.setattr(target, name, value)
+    return _set_attrs
+
+
+@pytest.fixture(scope="module")
+def monkeypatch_module() -> Generator[pytest.MonkeyPatch, None, None]:
+    """
+    A module-scoped counterpart of the built-in 'monkeypatch' fixture.
+    Patches applied through it stay in place for every test in the module
+    and are undone once when the module finishes.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        yield mp
+
+
+# --- Shared Test Data Factories ---
+# Each fixture is built once per session and returns a factory; calling it
+# yields a fresh SimpleNamespace, so tests may modify their copy freely.
+# Keyword arguments override the defaults, e.g. mock_invitation_code(is_active=False).
+
+@pytest.fixture(scope="session")
+def existing_user() -> Callable[..., SimpleNamespace]:
+    """A factory for an existing, active user in the database."""
+    return partial(
+        SimpleNamespace,
+        username="exist@user.com",
+        password_hash="hashed_password_for_goodpassword",
+        is_active=True
+    )
+
+
+@pytest.fixture(scope="session")
+def inactive_user() -> Callable[..., SimpleNamespace]:
+    """A factory for a user whose account has been deactivated."""
+    return partial(
+        SimpleNamespace,
+        username="inactive@user.com",
+        password_hash="hashed_password_for_goodpassword",
+        is_active=False
+    )
+
+
+@pytest.fixture(scope="session")
+def valid_invite_code() -> Callable[..., SimpleNamespace]:
+    """A factory for a valid and active invitation code."""
+    return partial(
+        SimpleNamespace,
+        code="VALIDCODE",
+        is_active=True
+    )
+
+
+@pytest.fixture(scope="session")
+def mock_invitation_code() -> Callable[..., SimpleNamespace]:
+    """A factory for an active invitation code with an expiry date."""
+    return partial(
+        SimpleNamespace,
+        id=1,
+        code="WELCOME2024",
+        description="Welcome invitation code",
+        is_active=True,
+        expires_at=datetime(2024, 12, 31, 23, 59, 59, tzinfo=timezone.utc),
+        created_at=datetime(2024, 1, 1, 0, 0, 0, tzinfo=timezone.utc),
+        updated_at=datetime(2024, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
+    )
+
+
+@pytest.fixture(scope="session")
+def mock_invitation_code_2() -> Callable[..., SimpleNamespace]:
+    """A factory for an inactive invitation code without an expiry date."""
+    return partial(
+        SimpleNamespace,
+        id=2,
+        code="SPECIAL2024",
+        description="Special invitation code",
+        is_active=False,
+        expires_at=None,
+        created_at=datetime(2024, 1, 2, 0, 0, 0, tzinfo=timezone.utc),
+        updated_at=datetime(2024, 1, 2, 0, 0, 0, tzinfo=timezone.utc)
+    )
@@ -6,255 +6,347 @@ This file contains a comprehensive set of tests for the following APIs:
 - GET /api/v1/users/check-status
 
 The tests are written following the Test-Driven Development (TDD) methodology.
-They use pytest and pytest-mock to simulate database interactions and security functions,
+They use pytest with module-wide unittest.mock stubs to simulate database interactions and security functions,
 ensuring that the API logic is tested in isolation without depending on a live database.
 
 Each test function corresponds to a specific test case defined in the product specification.
 The naming convention for test functions is `test_{endpoint}_{scenario}_should_{expected_outcome}`.
 """
+import asyncio
+import json
+
 import pytest
 from httpx import AsyncClient
+from types import SimpleNamespace
 from unittest.mock import MagicMock
+from fastapi.responses import JSONResponse
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
 
-# --- Test Data Constants ---
-# These constants are used across multiple tests to ensure consistency.
+from app.api.v1.endpoints import auth
+from app.main import validation_exception_handler
+from schemas.auth import LoginOrRegisterRequest
 
-# A mock user object that represents an existing, active user in the database.
-EXISTING_USER_MOCK = MagicMock(
-    username="exist@user.com",
-    password_hash="hashed_password_for_goodpassword",
-    is_active=True
-)
+# Every CRUD/security call is stubbed, so line tracing only adds per-test overhead here.
+NO_COVER = True  # see pytest_collection_modifyitems in conftest.py
 
-# A mock user object for an account that has been deactivated.
-INACTIVE_USER_MOCK = MagicMock(
-    username="inactive@user.com",
-    password_hash="hashed_password_for_goodpassword",
-    is_active=False
-)
 
-# A mock object for a valid and active invitation code.
-VALID_INVITE_CODE_MOCK = MagicMock(
-    code="VALIDCODE",
-    is_active=True
-)
+# --- Endpoint URLs ---
 
+LOR_URL = "/api/v1/auth/login-or-register"
+CHECK_STATUS_URL = "/api/v1/users/check-status"
 
-# --- Tests for POST /api/v1/auth/login-or-register ---
 
-@pytest.mark.asyncio
-async def test_lor_001_register_new_user_with_valid_code_should_succeed(async_client: AsyncClient, mocker):
-    """
-    Tests LOR-001: Successful registration for a new user with a valid invitation code.
-    """
-    # Arrange: Mock the dependencies for the registration success path.
-    # 1. The user does not exist in the database.
-    mocker.patch("app.api.v1.endpoints.auth.crud_user.get_user_by_username", return_value=None)
-    # 2. The invitation code is valid.
-    mocker.patch("app.api.v1.endpoints.auth.crud_invitation_code.get_valid_code", return_value=VALID_INVITE_CODE_MOCK)
-    # 3. The user creation function will return a new user object.
-    mocker.patch("app.api.v1.endpoints.auth.crud_user.create_user", return_value=MagicMock(username="test@user.com"))
-    # 4. The token creation function will return a mock token.
-    mocker.patch("app.api.v1.endpoints.auth.security.create_access_token", return_value="mock_jwt_token")
-
-    # Act: Send the registration request.
-    response = await async_client.post(
-        "/api/v1/auth/login-or-register",
-        json={"username": "test@user.com", "password": "goodpassword", "inviteCode": "VALIDCODE"}
-    )
+# --- Pre-serialized Request Bodies (sent with content= to skip per-request json.dumps) ---
 
-    # Assert: Verify the response matches the specification for successful registration.
-    assert response.status_code == 201
-    data = response.json()
-    assert data["success"] is True
-    assert data["message"] == "註冊成功"
-    assert "token" in data
-    assert data["token"]["access_token"] == "mock_jwt_token"
-    assert data["token"]["token_type"] == "bearer"
+JSON_HEADERS = {"Content-Type": "application/json"}
 
+REGISTER_WITH_VALID_CODE_BODY = json.dumps(
+    {"username": "test@user.com", "password": "goodpassword", "inviteCode": "VALIDCODE"}
+).encode()
+LOGIN_EXISTING_USER_BODY = json.dumps({"username": "exist@user.com", "password": "goodpassword"}).encode()
+REGISTER_WITHOUT_CODE_BODY = json.dumps({"username": "new@user.com", "password": "goodpassword"}).encode()
+REGISTER_WITH_CODE_BODIES = {
+    code: json.dumps({"username": "new@user.com", "password": "goodpassword", "inviteCode": code}).encode()
+    for code in ("FAKECODE", "INACTIVECODE")
+}
+LOGIN_WRONG_PASSWORD_BODY = json.dumps({"username": "exist@user.com", "password": "wrongpassword"}).encode()
+LOGIN_INACTIVE_USER_BODY = json.dumps({"username": "inactive@user.com", "password": "goodpassword"}).encode()
 
-@pytest.mark.asyncio
-async def test_lor_002_login_existing_user_with_correct_password_should_succeed(async_client: AsyncClient, mocker):
-    """
-    Tests LOR-002: Successful login for an existing user with the correct password.
-    """
-    # Arrange: Mock dependencies for the login success path.
-    # 1. The user exists and is active.
-    mocker.patch("app.api.v1.endpoints.auth.crud_user.get_user_by_username", return_value=EXISTING_USER_MOCK)
-    # 2. The password verification succeeds.
-    mocker.patch("app.api.v1.endpoints.auth.security.verify_password", return_value=True)
-    # 3. A token is created.
-    mocker.patch("app.api.v1.endpoints.auth.security.create_access_token", return_value="mock_jwt_token")
-
-    # Act: Send the login request.
-    response = await async_client.post(
-        "/api/v1/auth/login-or-register",
-        json={"username": "exist@user.com", "password": "goodpassword"}
-    )
+# (body, expected_message, expected_status_code) for the login-or-register validation sweep
+VALIDATION_CASES = [
+    (json.dumps({"username": "", "password": "password123"}).encode(), "帳號錯誤、請重新確認。", 400),  # LOR-008
+    (json.dumps({"username": "user@test.com", "password": ""}).encode(), "密碼錯誤、請重新確認。", 400),  # LOR-009
+    (json.dumps({"username": "not-an-email", "password": "password123"}).encode(), "帳號錯誤、請重新確認。", 400),  # LOR-010
+]
 
-    # Assert: Verify the response for successful login.
-    assert response.status_code == 200
-    data = response.json()
-    assert data["success"] is True
-    assert data["message"] == "登入成功"
-    assert "token" in data
 
+# --- Expected Response Bodies (rendered once by JSONResponse, compared byte-for-byte) ---
 
-@pytest.mark.asyncio
-async def test_lor_003_register_new_user_without_invite_code_should_fail(async_client: AsyncClient, mocker):
-    """
-    Tests LOR-003: A new user trying to register without an invite code should be rejected.
-    """
-    # Arrange: The user does not exist.
-    mocker.patch("app.api.v1.endpoints.auth.crud_user.get_user_by_username", return_value=None)
-
-    # Act: Send request without inviteCode.
-    response = await async_client.post(
-        "/api/v1/auth/login-or-register",
-        json={"username": "new@user.com", "password": "goodpassword"}
-    )
+EXPECTED_NOT_REGISTERED = JSONResponse({"detail": "您尚未註冊，請輸入邀請碼"}).body
+EXPECTED_INVALID_CODE = JSONResponse({"detail": "邀請碼無效。"}).body
+EXPECTED_WRONG_PASSWORD = JSONResponse({"detail": "密碼錯誤、請重新確認。"}).body
 
-    # Assert: Verify the specific error for missing invite code.
-    assert response.status_code == 402
-    assert response.json() == {"detail": "您尚未註冊，請輸入邀請碼"}
 
+# --- Shared Stubs ---
 
-@pytest.mark.asyncio
-@pytest.mark.parametrize("code, mock_return", [
-    ("FAKECODE", None),  # LOR-004: Code does not exist
-    ("INACTIVECODE", MagicMock(is_active=False)),  # LOR-005: Code is inactive
-])
-async def test_lor_004_005_register_with_invalid_or_inactive_code_should_fail(async_client: AsyncClient, mocker, code, mock_return):
+@pytest.fixture(scope="module")
+def _auth_stub_bank(monkeypatch_module):
     """
-    Tests LOR-004 & LOR-005: Registration fails if the invite code is non-existent or inactive.
+    Patch the CRUD and security functions used by the auth/users endpoints once per module.
+    The users endpoint imports the same crud.user module, so one stub covers both endpoints.
     """
-    # Arrange
-    mocker.patch("app.api.v1.endpoints.auth.crud_user.get_user_by_username", return_value=None)
-    mocker.patch("app.api.v1.endpoints.auth.crud_invitation_code.get_valid_code", return_value=mock_return)
-
-    # Act
-    response = await async_client.post(
-        "/api/v1/auth/login-or-register",
-        json={"username": "new@user.com", "password": "goodpassword", "inviteCode": code}
+    stubs = SimpleNamespace(
+        get_user_by_username=MagicMock(),
+        create_user=MagicMock(),
+        get_valid_code=MagicMock(),
+        verify_password=MagicMock(),
+        create_access_token=MagicMock(),
     )
-
-    # Assert
-    assert response.status_code == 400
-    assert response.json() == {"detail": "邀請碼無效。"}
+    monkeypatch_module.setattr(auth.crud_user, "get_user_by_username", stubs.get_user_by_username)
+    monkeypatch_module.setattr(auth.crud_user, "create_user", stubs.create_user)
+    monkeypatch_module.setattr(auth.crud_invitation_code, "get_valid_code", stubs.get_valid_code)
+    monkeypatch_module.setattr(auth.security, "verify_password", stubs.verify_password)
+    monkeypatch_module.setattr(auth.security, "create_access_token", stubs.create_access_token)
+    return stubs
 
 
-@pytest.mark.asyncio
-async def test_lor_006_login_with_wrong_password_should_fail(async_client: AsyncClient, mocker):
+@pytest.fixture(autouse=True)
+def auth_stubs(_auth_stub_bank):
     """
-    Tests LOR-006: Login fails for an existing user with an incorrect password.
+    Hand the module-wide stubs to each test with their configuration cleared,
+    so return values set by one test never leak into the next.
     """
-    # Arrange
-    mocker.patch("app.api.v1.endpoints.auth.crud_user.get_user_by_username", return_value=EXISTING_USER_MOCK)
-    mocker.patch("app.api.v1.endpoints.auth.security.verify_password", return_value=False) # Password mismatch
-
-    # Act
-    response = await async_client.post(
-        "/api/v1/auth/login-or-register",
-        json={"username": "exist@user.com", "password": "wrongpassword"}
-    )
-
-    # Assert
-    assert response.status_code == 401
-    assert response.json() == {"detail": "密碼錯誤、請重新確認。"}
+    for stub in vars(_auth_stub_bank).values():
+        stub.reset_mock(return_value=True, side_effect=True)
+    return _auth_stub_bank
 
 
-@pytest.mark.asyncio
-async def test_lor_007_login_with_inactive_account_should_fail(async_client: AsyncClient, mocker):
-    """
-    Tests LOR-007: Login fails if the user's account has been deactivated.
-    """
-    # Arrange: The user exists but is inactive.
-    mocker.patch("app.api.v1.endpoints.auth.crud_user.get_user_by_username", return_value=INACTIVE_USER_MOCK)
+# --- Tests for POST /api/v1/auth/login-or-register ---
 
-    # Act
-    response = await async_client.post(
-        "/api/v1/auth/login-or-register",
-        json={"username": "inactive@user.com", "password": "goodpassword"}
+class TestLoginOrRegister:
+    """Test cases for the combined login-or-register endpoint"""
+    
+    async def test_lor_001_register_new_user_with_valid_code_should_succeed(self, async_client: AsyncClient, auth_stubs, valid_invite_code):
+        """
+        Tests LOR-001: Successful registration for a new user with a valid invitation code.
+        """
+        # Arrange: Mock the dependencies for the registration success path.
+        # 1. The user does not exist in the database.
+        auth_stubs.get_user_by_username.return_value = None
+        # 2. The invitation code is valid.
+        auth_stubs.get_valid_code.return_value = valid_invite_code()
+        # 3. The user creation function will return a new user object.
+        auth_stubs.create_user.return_value = SimpleNamespace(username="test@user.com")
+        # 4. The token creation function will return a mock token.
+        auth_stubs.create_access_token.return_value = "mock_jwt_token"
+
+        # Act: Send the registration request.
+        response = await async_client.post(
+            LOR_URL,
+            content=REGISTER_WITH_VALID_CODE_BODY,
+            headers=JSON_HEADERS
+        )
+
+        # Assert: Verify the response matches the specification for successful registration.
+        assert response.status_code == 201
+        data = response.json()
+        assert data["success"] is True
+        assert data["message"] == "註冊成功"
+        assert "token" in data
+        assert data["token"]["access_token"] == "mock_jwt_token"
+        assert data["token"]["token_type"] == "bearer"
+
+    async def test_lor_002_login_existing_user_with_correct_password_should_succeed(self, async_client: AsyncClient, auth_stubs, existing_user):
+        """
+        Tests LOR-002: Successful login for an existing user with the correct password.
+        """
+        # Arrange: Mock dependencies for the login success path.
+        # 1. The user exists and is active.
+        auth_stubs.get_user_by_username.return_value = existing_user()
+        # 2. The password verification succeeds.
+        auth_stubs.verify_password.return_value = True
+        # 3. A token is created.
+        auth_stubs.create_access_token.return_value = "mock_jwt_token"
+
+        # Act: Send the login request.
+        response = await async_client.post(
+            LOR_URL,
+            content=LOGIN_EXISTING_USER_BODY,
+            headers=JSON_HEADERS
+        )
+
+        # Assert: Verify the response for successful login.
+        assert response.status_code == 200
+        data = response.json()
+        assert data["success"] is True
+        assert data["message"] == "登入成功"
+        assert "token" in data
+
+    async def test_lor_003_register_new_user_without_invite_code_should_fail(self, async_client: AsyncClient, auth_stubs):
+        """
+        Tests LOR-003: A new user trying to register without an invite code should be rejected.
+        """
+        # Arrange: The user does not exist.
+        auth_stubs.get_user_by_username.return_value = None
+
+        # Act: Send request without inviteCode.
+        response = await async_client.post(
+            LOR_URL,
+            content=REGISTER_WITHOUT_CODE_BODY,
+            headers=JSON_HEADERS
+        )
+
+        # Assert: Verify the specific error for missing invite code.
+        assert response.status_code == 402
+        assert response.content == EXPECTED_NOT_REGISTERED
+
+    async def test_lor_004_005_register_with_invalid_or_inactive_code_should_fail(self, async_client: AsyncClient, auth_stubs):
+        """
+        Tests LOR-004 & LOR-005: Registration fails if the invite code is non-existent or inactive.
+        Both codes are served by one stub keyed on the code and sent concurrently.
+        """
+        # Arrange
+        codes = {
+            "FAKECODE": None,  # LOR-004: Code does not exist
+            "INACTIVECODE": SimpleNamespace(is_active=False),  # LOR-005: Code is inactive
+        }
+        auth_stubs.get_user_by_username.return_value = None
+        auth_stubs.get_valid_code.side_effect = lambda db, code: codes[code]
+
+        # Act
+        responses = await asyncio.gather(*[
+            async_client.post(
+                LOR_URL,
+                content=REGISTER_WITH_CODE_BODIES[code],
+                headers=JSON_HEADERS
+            )
+            for code in codes
+        ])
+
+        # Assert
+        for code, response in zip(codes, responses):
+            assert response.status_code == 400, code
+            assert response.content == EXPECTED_INVALID_CODE, code
+
+    async def test_lor_006_login_with_wrong_password_should_fail(self, async_client: AsyncClient, auth_stubs, existing_user):
+        """
+        Tests LOR-006: Login fails for an existing user with an incorrect password.
+        """
+        # Arrange
+        auth_stubs.get_user_by_username.return_value = existing_user()
+        auth_stubs.verify_password.return_value = False  # Password mismatch
+
+        # Act
+        response = await async_client.post(
+            LOR_URL,
+            content=LOGIN_WRONG_PASSWORD_BODY,
+            headers=JSON_HEADERS
+        )
+
+        # Assert
+        assert response.status_code == 401
+        assert response.content == EXPECTED_WRONG_PASSWORD
+
+    async def test_lor_007_login_with_inactive_account_should_fail(self, async_client: AsyncClient, auth_stubs, inactive_user):
+        """
+        Tests LOR-007: Login fails if the user's account has been deactivated.
+        """
+        # Arrange: The user exists but is inactive.
+        auth_stubs.get_user_by_username.return_value = inactive_user()
+
+        # Act
+        response = await async_client.post(
+            LOR_URL,
+            content=LOGIN_INACTIVE_USER_BODY,
+            headers=JSON_HEADERS
+        )
+
+        # Assert: The error should be the same as a wrong password to avoid leaking user status.
+        assert response.status_code == 401
+        assert response.content == EXPECTED_WRONG_PASSWORD
+
+    async def test_lor_008_010_validation_checks_should_fail(self, async_client: AsyncClient):
+        """
+        Tests LOR-008, LOR-009, LOR-010: Validation for empty or malformed username/password.
+        The cases need no stubs, so they are built up front and sent concurrently as one batch.
+        """
+        # Arrange
+        requests = [
+            async_client.build_request("POST", LOR_URL, content=body, headers=JSON_HEADERS)
+            for body, _, _ in VALIDATION_CASES
+        ]
+
+        # Act
+        responses = await asyncio.gather(*[async_client.send(request) for request in requests])
+
+        # Assert
+        for (body, expected_message, expected_status_code), response in zip(VALIDATION_CASES, responses):
+            assert response.status_code == expected_status_code, body
+            assert response.json() == {"success": False, "message": expected_message}, body
+
+    @pytest.mark.parametrize(
+        "body, expected_message, expected_status_code", VALIDATION_CASES, ids=["LOR-008", "LOR-009", "LOR-010"]
     )
-
-    # Assert: The error should be the same as a wrong password to avoid leaking user status.
-    assert response.status_code == 401
-    assert response.json() == {"detail": "密碼錯誤、請重新確認。"}
-
-
-@pytest.mark.asyncio
-@pytest.mark.parametrize("payload, expected_message, expected_status_code", [
-    ({"username": "", "password": "password123"}, "帳號錯誤、請重新確認。", 400), # LOR-008
-    ({"username": "user@test.com", "password": ""}, "密碼錯誤、請重新確認。", 400), # LOR-009
-    ({"username": "not-an-email", "password": "password123"}, "帳號錯誤、請重新確認。", 400), # LOR-010
-])
-async def test_lor_008_010_validation_checks_should_fail(async_client: AsyncClient, payload, expected_message, expected_status_code):
-    """
-    Tests LOR-008, LOR-009, LOR-010: Validation for empty or malformed username/password.
-    """
-    # Act
-    response = await async_client.post("/api/v1/auth/login-or-register", json=payload)
-
-    # Assert
-    assert response.status_code == expected_status_code
-    assert response.json() == {"success": False, "message": expected_message}
+    async def test_lor_008_010_validation_handler_maps_messages(self, body, expected_message, expected_status_code):
+        """
+        Tests LOR-008, LOR-009, LOR-010 at the handler level: the validation errors raised for each body
+        are passed straight to the app's validation handler, without routing a request through ASGI.
+        The wire-level sweep above covers the handler being wired into the app.
+        """
+        # Arrange: Produce the same errors FastAPI would raise while parsing the request body.
+        with pytest.raises(ValidationError) as exc_info:
+            LoginOrRegisterRequest.model_validate_json(body)
+        errors = [{**error, "loc": ("body", *error["loc"])} for error in exc_info.value.errors()]
+
+        # Act
+        response = await validation_exception_handler(None, RequestValidationError(errors))
+
+        # Assert
+        assert response.status_code == expected_status_code
+        response_data = json.loads(response.body)
+        assert response_data["success"] == False
+        assert response_data["message"] == expected_message
 
 
 # --- Tests for GET /api/v1/users/check-status ---
 
-@pytest.mark.asyncio
-async def test_chk_001_check_status_for_registered_user_should_return_true(async_client: AsyncClient, mocker):
-    """
-    Tests CHK-001: Checking status for a registered and active user.
-    """
-    # Arrange: User exists and is active.
-    mocker.patch("app.api.v1.endpoints.users.crud_user.get_user_by_username", return_value=EXISTING_USER_MOCK)
-
-    # Act
-    response = await async_client.get("/api/v1/users/check-status?username=exist@user.com")
-
-    # Assert
-    assert response.status_code == 200
-    response_data = response.json()
-    assert response_data["success"] == True
-    assert response_data["message"] == "查詢成功"
-    assert response_data["data"]["isRegistered"] == True
-
-
-@pytest.mark.asyncio
-@pytest.mark.parametrize("mock_return", [
-    (None),  # CHK-002: User does not exist
-    (INACTIVE_USER_MOCK),  # CHK-003: User is inactive
-])
-async def test_chk_002_003_check_status_for_unregistered_or_inactive_user_should_return_false(async_client: AsyncClient, mocker, mock_return):
-    """
-    Tests CHK-002 & CHK-003: Status check for a non-existent or inactive user should return false.
-    """
-    # Arrange
-    mocker.patch("app.api.v1.endpoints.users.crud_user.get_user_by_username", return_value=mock_return)
-
-    # Act
-    response = await async_client.get("/api/v1/users/check-status?username=nonexist@user.com")
-
-    # Assert
-    assert response.status_code == 200
-    response_data = response.json()
-    assert response_data["success"] == True
-    assert response_data["message"] == "查詢成功"
-    assert response_data["data"]["isRegistered"] == False
-
-
-@pytest.mark.asyncio
-async def test_chk_004_check_status_without_username_should_fail(async_client: AsyncClient):
-    """
-    Tests CHK-004: Requesting status without a username query parameter should result in a validation error.
-    """
-    # Act
-    response = await async_client.get("/api/v1/users/check-status")
-
-    # Assert: The custom validation handler should return a 400 Bad Request.
-    assert response.status_code == 400
-    response_data = response.json()
-    assert response_data["success"] == False
-    assert response_data["message"] == "帳號錯誤、請重新確認。"
-    assert response_data["error_code"] == "VALIDATION_ERROR"
+class TestCheckStatus:
+    """Test cases for the registration status check endpoint"""
+    
+    async def test_chk_001_check_status_for_registered_user_should_return_true(self, async_client: AsyncClient, auth_stubs, existing_user):
+        """
+        Tests CHK-001: Checking status for a registered and active user.
+        """
+        # Arrange: User exists and is active.
+        auth_stubs.get_user_by_username.return_value = existing_user()
+
+        # Act
+        response = await async_client.get(CHECK_STATUS_URL, params={"username": "exist@user.com"})
+
+        # Assert
+        assert response.status_code == 200
+        response_data = response.json()
+        assert response_data["success"] == True
+        assert response_data["message"] == "查詢成功"
+        assert response_data["data"]["isRegistered"] == True
+
+    async def test_chk_002_003_check_status_for_unregistered_or_inactive_user_should_return_false(self, async_client: AsyncClient, auth_stubs, inactive_user):
+        """
+        Tests CHK-002 & CHK-003: Status check for a non-existent or inactive user should return false.
+        Both lookups are served by one stub keyed on username and sent concurrently.
+        """
+        # Arrange
+        users = {
+            "nonexist@user.com": None,  # CHK-002: User does not exist
+            "inactive@user.com": inactive_user(),  # CHK-003: User is inactive
+        }
+        auth_stubs.get_user_by_username.side_effect = lambda db, username: users[username]
+
+        # Act
+        responses = await asyncio.gather(*[
+            async_client.get(CHECK_STATUS_URL, params={"username": username})
+            for username in users
+        ])
+
+        # Assert
+        for username, response in zip(users, responses):
+            assert response.status_code == 200, username
+            response_data = response.json()
+            assert response_data["success"] == True
+            assert response_data["message"] == "查詢成功"
+            assert response_data["data"]["isRegistered"] == False, username
+
+    async def test_chk_004_check_status_without_username_should_fail(self, async_client: AsyncClient):
+        """
+        Tests CHK-004: Requesting status without a username query parameter should result in a validation error.
+        """
+        # Act
+        response = await async_client.get(CHECK_STATUS_URL)
+
+        # Assert: The custom validation handler should return a 400 Bad Request.
+        assert response.status_code == 400
+        response_data = response.json()
+        assert response_data["success"] == False
+        assert response_data["message"] == "帳號錯誤、請重新確認。"
+        assert response_data["error_code"] == "VALIDATION_ERROR"
@@ -10,366 +10,363 @@ This file contains comprehensive tests for the following APIs:
 The tests follow Test-Driven Development (TDD) methodology and use pytest with mocking
 to test the API logic in isolation.
 """
+import asyncio
+import json
+
 import pytest
 from httpx import AsyncClient
+from types import SimpleNamespace
 from unittest.mock import MagicMock
+from fastapi.responses import JSONResponse
 from datetime import datetime, timezone
 
+from app.api.v1.endpoints import admin
 
-# --- Test Data Constants ---
+# Every CRUD/security call is stubbed, so line tracing only adds per-test overhead here.
+NO_COVER = True  # see pytest_collection_modifyitems in conftest.py
 
-# Mock invitation code objects for testing
-MOCK_INVITATION_CODE = MagicMock(
-    id=1,
-    code="WELCOME2024",
-    description="Welcome invitation code",
-    is_active=True,
-    expires_at=datetime(2024, 12, 31, 23, 59, 59, tzinfo=timezone.utc),
-    created_at=datetime(2024, 1, 1, 0, 0, 0, tzinfo=timezone.utc),
-    updated_at=datetime(2024, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
-)
 
-MOCK_INVITATION_CODE_2 = MagicMock(
-    id=2,
-    code="SPECIAL2024",
-    description="Special invitation code",
-    is_active=False,
-    expires_at=None,
-    created_at=datetime(2024, 1, 2, 0, 0, 0, tzinfo=timezone.utc),
-    updated_at=datetime(2024, 1, 2, 0, 0, 0, tzinfo=timezone.utc)
-)
+# --- Endpoint URLs ---
 
+INVITATION_CODES_URL = "/api/v1/admin/invitation-codes"
+INVITATION_CODE_URL = f"{INVITATION_CODES_URL}/1"
+MISSING_INVITATION_CODE_URL = f"{INVITATION_CODES_URL}/999"
 
-# --- Tests for POST /api/v1/admin/invitation-codes ---
 
-@pytest.mark.asyncio
-async def test_create_invitation_code_success_should_return_201(async_client: AsyncClient, mocker):
-    """
-    Test successful creation of a new invitation code.
-    """
-    # Arrange: Mock the dependencies
-    mocker.patch("app.api.v1.endpoints.admin.crud_invitation_code.get_invitation_code_by_code", return_value=None)
-    mocker.patch("app.api.v1.endpoints.admin.crud_invitation_code.create_invitation_code", return_value=MOCK_INVITATION_CODE)
-
-    # Act: Send the creation request
-    response = await async_client.post(
-        "/api/v1/admin/invitation-codes",
-        json={
-            "code": "WELCOME2024",
-            "description": "Welcome invitation code",
-            "expires_at": "2024-12-31T23:59:59Z"
-        }
-    )
+# --- Pre-serialized Request Bodies (sent with content= to skip per-request json.dumps) ---
 
-    # Assert: Verify the response
-    assert response.status_code == 201
-    data = response.json()
-    assert data["id"] == 1
-    assert data["code"] == "WELCOME2024"
-    assert data["description"] == "Welcome invitation code"
-    assert data["is_active"] is True
+JSON_HEADERS = {"Content-Type": "application/json"}
 
+CREATE_CODE_BODY = json.dumps({
+    "code": "WELCOME2024",
+    "description": "Welcome invitation code",
+    "expires_at": "2024-12-31T23:59:59Z"
+}).encode()
+CREATE_DUPLICATE_CODE_BODY = json.dumps({"code": "WELCOME2024", "description": "Duplicate code"}).encode()
+CREATE_MISSING_CODE_BODY = json.dumps({"description": "Missing code"}).encode()
+CREATE_EMPTY_CODE_BODY = json.dumps({"code": "", "description": "Empty code"}).encode()
+CREATE_EMPTY_EXPIRES_AT_BODY = json.dumps({
+    "code": "TEST_EMPTY",
+    "description": "Test empty expires_at",
+    "expires_at": ""  # Empty string should be converted to None
+}).encode()
+UPDATE_CODE_BODY = json.dumps({"description": "Updated description", "is_active": False}).encode()
+UPDATE_DESCRIPTION_BODY = json.dumps({"description": "Updated description"}).encode()
+DEACTIVATE_CODE_BODY = json.dumps({"is_active": False}).encode()
+EMPTY_BODY = json.dumps({}).encode()
 
-@pytest.mark.asyncio
-async def test_create_invitation_code_duplicate_should_return_409(async_client: AsyncClient, mocker):
-    """
-    Test creation with duplicate code should return 409 Conflict.
-    """
-    # Arrange: Mock that the code already exists
-    mocker.patch("app.api.v1.endpoints.admin.crud_invitation_code.get_invitation_code_by_code", return_value=MOCK_INVITATION_CODE)
-
-    # Act: Send the creation request
-    response = await async_client.post(
-        "/api/v1/admin/invitation-codes",
-        json={
-            "code": "WELCOME2024",
-            "description": "Duplicate code"
-        }
-    )
-
-    # Assert: Verify the conflict response
-    assert response.status_code == 409
-    assert response.json() == {"detail": "邀請碼已存在"}
 
+# --- Expected Response Bodies (rendered once by JSONResponse, compared byte-for-byte) ---
 
-@pytest.mark.asyncio
-async def test_create_invitation_code_missing_code_should_return_400(async_client: AsyncClient):
-    """
-    Test creation without required code field should return 400 Bad Request.
-    """
-    # Act: Send request without code
-    response = await async_client.post(
-        "/api/v1/admin/invitation-codes",
-        json={
-            "description": "Missing code"
-        }
-    )
-
-    # Assert: Verify validation error
-    assert response.status_code == 400  # Custom validation error handling
-
-
-@pytest.mark.asyncio
-async def test_create_invitation_code_empty_code_should_return_400(async_client: AsyncClient):
-    """
-    Test creation with empty code should return 400 Bad Request.
-    """
-    # Act: Send request with empty code
-    response = await async_client.post(
-        "/api/v1/admin/invitation-codes",
-        json={
-            "code": "",
-            "description": "Empty code"
-        }
-    )
+EXPECTED_DUPLICATE_CODE = JSONResponse({"detail": "邀請碼已存在"}).body
+EXPECTED_CODE_NOT_FOUND = JSONResponse({"detail": "邀請碼不存在"}).body
 
-    # Assert: Verify validation error
-    assert response.status_code == 400  # Custom validation error handling
 
+# --- Shared Stubs ---
 
-@pytest.mark.asyncio
-async def test_create_invitation_code_empty_expires_at_should_return_201(async_client: AsyncClient, mocker):
+@pytest.fixture(scope="module")
+def _admin_stub_bank(monkeypatch_module):
     """
-    Test creation with empty string expires_at should be converted to None and succeed.
+    Patch the invitation code CRUD functions used by the admin endpoints once per module.
     """
-    # Arrange: Mock the dependencies
-    mocker.patch("app.api.v1.endpoints.admin.crud_invitation_code.get_invitation_code_by_code", return_value=None)
-    mock_created = MagicMock(
-        id=1,
-        code="TEST_EMPTY",
-        description="Test empty expires_at",
-        is_active=True,
-        expires_at=None,  # Should be None after validation
-        created_at=datetime(2024, 1, 1, 0, 0, 0, tzinfo=timezone.utc),
-        updated_at=datetime(2024, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
-    )
-    mocker.patch("app.api.v1.endpoints.admin.crud_invitation_code.create_invitation_code", return_value=mock_created)
-
-    # Act: Send request with empty string expires_at
-    response = await async_client.post(
-        "/api/v1/admin/invitation-codes",
-        json={
-            "code": "TEST_EMPTY",
-            "description": "Test empty expires_at",
-            "expires_at": ""  # Empty string should be converted to None
-        }
+    stubs = SimpleNamespace(
+        get_invitation_code_by_code=MagicMock(),
+        create_invitation_code=MagicMock(),
+        get_invitation_codes=MagicMock(),
+        update_invitation_code=MagicMock(),
+        soft_delete_invitation_code=MagicMock(),
     )
+    for name, stub in vars(stubs).items():
+        monkeypatch_module.setattr(admin.crud_invitation_code, name, stub)
+    return stubs
 
-    # Assert: Verify success
-    assert response.status_code == 201
-    data = response.json()
-    assert data["expires_at"] is None
-
-
-# --- Tests for GET /api/v1/admin/invitation-codes ---
 
-@pytest.mark.asyncio
-async def test_get_invitation_codes_success_should_return_200(async_client: AsyncClient, mocker):
+@pytest.fixture(autouse=True)
+def admin_stubs(_admin_stub_bank):
     """
-    Test successful retrieval of invitation codes list.
+    Hand the module-wide stubs to each test with their configuration cleared,
+    so return values set by one test never leak into the next.
     """
-    # Arrange: Mock the database response
-    mock_codes = [MOCK_INVITATION_CODE, MOCK_INVITATION_CODE_2]
-    mocker.patch("app.api.v1.endpoints.admin.crud_invitation_code.get_invitation_codes", return_value=(mock_codes, 2))
+    for stub in vars(_admin_stub_bank).values():
+        stub.reset_mock(return_value=True, side_effect=True)
+    return _admin_stub_bank
 
-    # Act: Send the list request
-    response = await async_client.get("/api/v1/admin/invitation-codes")
 
-    # Assert: Verify the response
-    assert response.status_code == 200
-    data = response.json()
-    assert len(data["items"]) == 2
-    assert data["total"] == 2
-    assert data["page"] == 1
-    assert data["size"] == 20
-    assert data["pages"] == 1
-
-
-@pytest.mark.asyncio
-async def test_get_invitation_codes_with_active_filter_should_return_200(async_client: AsyncClient, mocker):
-    """
-    Test retrieval with active status filter.
-    """
-    # Arrange: Mock filtering for active codes only
-    mock_codes = [MOCK_INVITATION_CODE]
-    mocker.patch("app.api.v1.endpoints.admin.crud_invitation_code.get_invitation_codes", return_value=(mock_codes, 1))
-
-    # Act: Send request with filter
-    response = await async_client.get("/api/v1/admin/invitation-codes?is_active=true")
-
-    # Assert: Verify the filtered response
-    assert response.status_code == 200
-    data = response.json()
-    assert len(data["items"]) == 1
-    assert data["total"] == 1
+# --- Tests for POST /api/v1/admin/invitation-codes ---
 
+class TestCreateInvitationCode:
+    """Test cases for creating invitation codes"""
+    
+    @pytest.mark.parametrize("body, expected_code, expected_description, expected_no_expiry", [
+        (CREATE_CODE_BODY, "WELCOME2024", "Welcome invitation code", False),
+        (CREATE_EMPTY_EXPIRES_AT_BODY, "TEST_EMPTY", "Test empty expires_at", True),  # Empty string becomes None
+    ], ids=["with_expires_at", "empty_expires_at"])
+    async def test_create_invitation_code_success_should_return_201(
+        self, async_client: AsyncClient, admin_stubs, mock_invitation_code,
+        body, expected_code, expected_description, expected_no_expiry
+    ):
+        """
+        Test successful creation of a new invitation code, including an empty string
+        expires_at that should be converted to None. The created record echoes the
+        validated request, so one stub serves both cases.
+        """
+        # Arrange: Mock the dependencies
+        admin_stubs.get_invitation_code_by_code.return_value = None
+        admin_stubs.create_invitation_code.side_effect = lambda db, invitation_code: mock_invitation_code(
+            code=invitation_code.code,
+            description=invitation_code.description,
+            expires_at=invitation_code.expires_at
+        )
+
+        # Act: Send the creation request
+        response = await async_client.post(
+            INVITATION_CODES_URL,
+            content=body,
+            headers=JSON_HEADERS
+        )
+
+        # Assert: Verify the response
+        assert response.status_code == 201
+        data = response.json()
+        assert data["id"] == 1
+        assert data["code"] == expected_code
+        assert data["description"] == expected_description
+        assert data["is_active"] is True
+        assert (data["expires_at"] is None) is expected_no_expiry
+
+    async def test_create_invitation_code_duplicate_should_return_409(self, async_client: AsyncClient, admin_stubs, mock_invitation_code):
+        """
+        Test creation with duplicate code should return 409 Conflict.
+        """
+        # Arrange: Mock that the code already exists
+        admin_stubs.get_invitation_code_by_code.return_value = mock_invitation_code()
+
+        # Act: Send the creation request
+        response = await async_client.post(
+            INVITATION_CODES_URL,
+            content=CREATE_DUPLICATE_CODE_BODY,
+            headers=JSON_HEADERS
+        )
+
+        # Assert: Verify the conflict response
+        assert response.status_code == 409
+        assert response.content == EXPECTED_DUPLICATE_CODE
+
+    async def test_create_invitation_code_missing_code_should_return_400(self, async_client: AsyncClient):
+        """
+        Test creation without required code field should return 400 Bad Request.
+        """
+        # Act: Send request without code
+        response = await async_client.post(
+            INVITATION_CODES_URL,
+            content=CREATE_MISSING_CODE_BODY,
+            headers=JSON_HEADERS
+        )
+
+        # Assert: Verify validation error
+        assert response.status_code == 400  # Custom validation error handling
+
+    async def test_create_invitation_code_empty_code_should_return_400(self, async_client: AsyncClient):
+        """
+        Test creation with empty code should return 400 Bad Request.
+        """
+        # Act: Send request with empty code
+        response = await async_client.post(
+            INVITATION_CODES_URL,
+            content=CREATE_EMPTY_CODE_BODY,
+            headers=JSON_HEADERS
+        )
+
+        # Assert: Verify validation error
+        assert response.status_code == 400  # Custom validation error handling
 
-@pytest.mark.asyncio
-async def test_get_invitation_codes_with_pagination_should_return_200(async_client: AsyncClient, mocker):
-    """
-    Test retrieval with pagination parameters.
-    """
-    # Arrange: Mock paginated response
-    mock_codes = [MOCK_INVITATION_CODE]
-    mocker.patch("app.api.v1.endpoints.admin.crud_invitation_code.get_invitation_codes", return_value=(mock_codes, 10))
 
-    # Act: Send request with pagination
-    response = await async_client.get("/api/v1/admin/invitation-codes?page=2&size=5")
+# --- Tests for GET /api/v1/admin/invitation-codes ---
 
-    # Assert: Verify the paginated response
-    assert response.status_code == 200
-    data = response.json()
-    assert data["page"] == 2
-    assert data["size"] == 5
-    assert data["pages"] == 2  # 10 total / 5 size = 2 pages
+class TestListInvitationCodes:
+    """Test cases for listing invitation codes"""
+    
+    async def test_get_invitation_codes_success_should_return_200(self, async_client: AsyncClient, admin_stubs, mock_invitation_code, mock_invitation_code_2):
+        """
+        Test successful retrieval of invitation codes list.
+        """
+        # Arrange: Mock the database response
+        mock_codes = [mock_invitation_code(), mock_invitation_code_2()]
+        admin_stubs.get_invitation_codes.return_value = (mock_codes, 2)
+
+        # Act: Send the list request
+        response = await async_client.get(INVITATION_CODES_URL)
+
+        # Assert: Verify the response
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["items"]) == 2
+        assert data["total"] == 2
+        assert data["page"] == 1
+        assert data["size"] == 20
+        assert data["pages"] == 1
+
+    async def test_get_invitation_codes_with_active_filter_should_return_200(self, async_client: AsyncClient, admin_stubs, mock_invitation_code):
+        """
+        Test retrieval with active status filter.
+        """
+        # Arrange: Mock filtering for active codes only
+        mock_codes = [mock_invitation_code()]
+        admin_stubs.get_invitation_codes.return_value = (mock_codes, 1)
+
+        # Act: Send request with filter
+        response = await async_client.get(INVITATION_CODES_URL, params={"is_active": "true"})
+
+        # Assert: Verify the filtered response
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["items"]) == 1
+        assert data["total"] == 1
+
+    async def test_get_invitation_codes_with_pagination_should_return_200(self, async_client: AsyncClient, admin_stubs, mock_invitation_code):
+        """
+        Test retrieval with pagination parameters.
+        """
+        # Arrange: Mock paginated response
+        mock_codes = [mock_invitation_code()]
+        admin_stubs.get_invitation_codes.return_value = (mock_codes, 10)
+
+        # Act: Send request with pagination
+        response = await async_client.get(INVITATION_CODES_URL, params={"page": 2, "size": 5})
+
+        # Assert: Verify the paginated response
+        assert response.status_code == 200
+        data = response.json()
+        assert data["page"] == 2
+        assert data["size"] == 5
+        assert data["pages"] == 2  # 10 total / 5 size = 2 pages
 
 
 # --- Tests for PATCH /api/v1/admin/invitation-codes/{id} ---
 
-@pytest.mark.asyncio
-async def test_update_invitation_code_success_should_return_200(async_client: AsyncClient, mocker):
-    """
-    Test successful update of an invitation code.
-    """
-    # Arrange: Mock successful update
-    updated_mock = MagicMock(
-        id=1,
-        code="WELCOME2024",
-        description="Updated description",
-        is_active=False,
-        expires_at=None,
-        created_at=datetime(2024, 1, 1, 0, 0, 0, tzinfo=timezone.utc),
-        updated_at=datetime(2024, 1, 15, 0, 0, 0, tzinfo=timezone.utc)
-    )
-    mocker.patch("app.api.v1.endpoints.admin.crud_invitation_code.update_invitation_code", return_value=updated_mock)
-
-    # Act: Send the update request
-    response = await async_client.patch(
-        "/api/v1/admin/invitation-codes/1",
-        json={
-            "description": "Updated description",
-            "is_active": False
-        }
-    )
-
-    # Assert: Verify the response
-    assert response.status_code == 200
-    data = response.json()
-    assert data["id"] == 1
-    assert data["description"] == "Updated description"
-    assert data["is_active"] is False
-
-
-@pytest.mark.asyncio
-async def test_update_invitation_code_not_found_should_return_404(async_client: AsyncClient, mocker):
-    """
-    Test update of non-existent invitation code should return 404.
-    """
-    # Arrange: Mock that the code doesn't exist
-    mocker.patch("app.api.v1.endpoints.admin.crud_invitation_code.update_invitation_code", return_value=None)
-
-    # Act: Send update request for non-existent code
-    response = await async_client.patch(
-        "/api/v1/admin/invitation-codes/999",
-        json={
-            "description": "Updated description"
-        }
-    )
-
-    # Assert: Verify not found response
-    assert response.status_code == 404
-    assert response.json() == {"detail": "邀請碼不存在"}
-
-
-@pytest.mark.asyncio
-async def test_update_invitation_code_partial_update_should_return_200(async_client: AsyncClient, mocker):
-    """
-    Test partial update (only one field) should work correctly.
-    """
-    # Arrange: Mock partial update
-    updated_mock = MagicMock(**MOCK_INVITATION_CODE.__dict__)
-    updated_mock.is_active = False
-    mocker.patch("app.api.v1.endpoints.admin.crud_invitation_code.update_invitation_code", return_value=updated_mock)
-
-    # Act: Send partial update
-    response = await async_client.patch(
-        "/api/v1/admin/invitation-codes/1",
-        json={
-            "is_active": False
-        }
-    )
-
-    # Assert: Verify partial update response
-    assert response.status_code == 200
-    data = response.json()
-    assert data["is_active"] is False
+class TestUpdateInvitationCode:
+    """Test cases for updating invitation codes"""
+    
+    async def test_update_invitation_code_success_should_return_200(self, async_client: AsyncClient, admin_stubs, mock_invitation_code):
+        """
+        Test successful update of an invitation code.
+        """
+        # Arrange: Mock successful update
+        admin_stubs.update_invitation_code.return_value = mock_invitation_code(
+            description="Updated description",
+            is_active=False,
+            expires_at=None,
+            updated_at=datetime(2024, 1, 15, 0, 0, 0, tzinfo=timezone.utc)
+        )
+
+        # Act: Send the update request
+        response = await async_client.patch(
+            INVITATION_CODE_URL,
+            content=UPDATE_CODE_BODY,
+            headers=JSON_HEADERS
+        )
+
+        # Assert: Verify the response
+        assert response.status_code == 200
+        data = response.json()
+        assert data["id"] == 1
+        assert data["description"] == "Updated description"
+        assert data["is_active"] is False
+
+    async def test_update_invitation_code_partial_update_should_return_200(self, async_client: AsyncClient, admin_stubs, mock_invitation_code):
+        """
+        Test partial update (only one field) should work correctly.
+        """
+        # Arrange: Mock partial update
+        admin_stubs.update_invitation_code.return_value = mock_invitation_code(is_active=False)
+
+        # Act: Send partial update
+        response = await async_client.patch(
+            INVITATION_CODE_URL,
+            content=DEACTIVATE_CODE_BODY,
+            headers=JSON_HEADERS
+        )
+
+        # Assert: Verify partial update response
+        assert response.status_code == 200
+        data = response.json()
+        assert data["is_active"] is False
 
 
 # --- Tests for DELETE /api/v1/admin/invitation-codes/{id} ---
 
-@pytest.mark.asyncio
-async def test_delete_invitation_code_success_should_return_204(async_client: AsyncClient, mocker):
-    """
-    Test successful soft deletion of an invitation code.
-    """
-    # Arrange: Mock successful soft delete
-    deactivated_mock = MagicMock(**MOCK_INVITATION_CODE.__dict__)
-    deactivated_mock.is_active = False
-    mocker.patch("app.api.v1.endpoints.admin.crud_invitation_code.soft_delete_invitation_code", return_value=deactivated_mock)
-
-    # Act: Send delete request
-    response = await async_client.delete("/api/v1/admin/invitation-codes/1")
-
-    # Assert: Verify no content response
-    assert response.status_code == 204
-
+class TestDeleteInvitationCode:
+    """Test cases for soft-deleting invitation codes"""
+    
+    async def test_delete_invitation_code_success_should_return_204(self, async_client: AsyncClient, admin_stubs, mock_invitation_code):
+        """
+        Test successful soft deletion of an invitation code.
+        """
+        # Arrange: Mock successful soft delete
+        admin_stubs.soft_delete_invitation_code.return_value = mock_invitation_code(is_active=False)
 
-@pytest.mark.asyncio
-async def test_delete_invitation_code_not_found_should_return_404(async_client: AsyncClient, mocker):
-    """
-    Test deletion of non-existent invitation code should return 404.
-    """
-    # Arrange: Mock that the code doesn't exist
-    mocker.patch("app.api.v1.endpoints.admin.crud_invitation_code.soft_delete_invitation_code", return_value=None)
+        # Act: Send delete request
+        response = await async_client.delete(INVITATION_CODE_URL)
 
-    # Act: Send delete request for non-existent code
-    response = await async_client.delete("/api/v1/admin/invitation-codes/999")
-
-    # Assert: Verify not found response
-    assert response.status_code == 404
-    assert response.json() == {"detail": "邀請碼不存在"}
+        # Assert: Verify no content response
+        assert response.status_code == 204
 
 
 # --- Edge Cases and Validation Tests ---
 
-@pytest.mark.asyncio
-async def test_get_invitation_codes_invalid_page_should_handle_gracefully(async_client: AsyncClient, mocker):
-    """
-    Test handling of invalid pagination parameters.
-    """
-    # Arrange: Mock empty response for invalid page
-    mocker.patch("app.api.v1.endpoints.admin.crud_invitation_code.get_invitation_codes", return_value=([], 0))
-
-    # Act: Send request with invalid page
-    response = await async_client.get("/api/v1/admin/invitation-codes?page=0")
-
-    # Assert: Should handle validation error for invalid page
-    assert response.status_code == 400
-
-
-@pytest.mark.asyncio
-async def test_update_invitation_code_empty_request_should_return_200(async_client: AsyncClient, mocker):
-    """
-    Test update with empty request body should return the unchanged object.
-    """
-    # Arrange: Mock update with no changes
-    mocker.patch("app.api.v1.endpoints.admin.crud_invitation_code.update_invitation_code", return_value=MOCK_INVITATION_CODE)
-
-    # Act: Send empty update
-    response = await async_client.patch(
-        "/api/v1/admin/invitation-codes/1",
-        json={}
-    )
-
-    # Assert: Should return unchanged object
-    assert response.status_code == 200
\ No newline at end of file
+class TestInvitationCodeEdgeCases:
+    """Edge cases and validation for the invitation code endpoints"""
+    
+    async def test_get_invitation_codes_invalid_page_should_handle_gracefully(self, async_client: AsyncClient, admin_stubs):
+        """
+        Test handling of invalid pagination parameters.
+        """
+        # Arrange: Mock empty response for invalid page
+        admin_stubs.get_invitation_codes.return_value = ([], 0)
+
+        # Act: Send request with invalid page
+        response = await async_client.get(INVITATION_CODES_URL, params={"page": 0})
+
+        # Assert: Should handle validation error for invalid page
+        assert response.status_code == 400
+
+    async def test_update_or_delete_missing_invitation_code_should_return_404(self, async_client: AsyncClient, admin_stubs):
+        """
+        Test update and deletion of a non-existent invitation code should both return 404.
+        Both CRUD calls find nothing, so the two requests are sent concurrently.
+        """
+        # Arrange: Mock that the code doesn't exist
+        admin_stubs.update_invitation_code.return_value = None
+        admin_stubs.soft_delete_invitation_code.return_value = None
+
+        # Act: Send update and delete requests for the non-existent code
+        responses = await asyncio.gather(
+            async_client.patch(
+                MISSING_INVITATION_CODE_URL,
+                content=UPDATE_DESCRIPTION_BODY,
+                headers=JSON_HEADERS
+            ),
+            async_client.delete(MISSING_INVITATION_CODE_URL),
+        )
+
+        # Assert: Verify not found responses
+        for method, response in zip(("PATCH", "DELETE"), responses):
+            assert response.status_code == 404, method
+            assert response.content == EXPECTED_CODE_NOT_FOUND, method
+
+    async def test_update_invitation_code_empty_request_should_return_200(self, async_client: AsyncClient, admin_stubs, mock_invitation_code):
+        """
+        Test update with empty request body should return the unchanged object.
+        """
+        # Arrange: Mock update with no changes
+        admin_stubs.update_invitation_code.return_value = mock_invitation_code()
+
+        # Act: Send empty update
+        response = await async_client.patch(
+            INVITATION_CODE_URL,
+            content=EMPTY_BODY,
+            headers=JSON_HEADERS
+        )
+
+        # Assert: Should return unchanged object
+        assert response.status_code == 200
\ No newline at end of file
@@ -7,7 +7,57 @@ import pytest
 from httpx import AsyncClient
 from schemas.response import SuccessResponse
 from typing import List
-from core.security import create_access_token
+from types import SimpleNamespace
+from dataclasses import dataclass
+from unittest.mock import MagicMock
+
+import dependencies
+from app.api.v1.endpoints import keywords
+from database.session import get_db
+
+
+# Test fixtures and helpers
+class MockKeyword:
+    def __init__(self, keyword: str):
+        self.keyword = keyword
+
+
+@dataclass(frozen=True, slots=True)
+class MockUser:
+    id: int
+    username: str
+    is_active: bool = True
+
+
+ACTIVE_USER_MOCK = MockUser(id=1, username="test@example.com", is_active=True)
+
+# Keyword rows are read-only in these tests, so one set of tuples is shared by every test
+PYTHON_FASTAPI_TEST_KEYWORDS = (MockKeyword("Python"), MockKeyword("FastAPI"), MockKeyword("測試"))
+PYTHON_FASTAPI_KEYWORDS = PYTHON_FASTAPI_TEST_KEYWORDS[:2]
+REACT_KEYWORDS = (MockKeyword("React"),)
+
+
+# Stand-in session handed to the stubbed CRUD calls; no real database session is opened
+FAKE_DB = SimpleNamespace()
+
+
+def returns(value):
+    """Helper function to build a stub that ignores its arguments and returns value"""
+    return lambda *args, **kwargs: value
+
+
+@pytest.fixture(autouse=True, scope="module")
+def fake_db(app):
+    """Serve FAKE_DB from get_db for the whole module instead of opening a SQLAlchemy session per request"""
+    app.dependency_overrides[get_db] = lambda: FAKE_DB
+    yield FAKE_DB
+    app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.fixture(autouse=True, scope="module")
+def authenticated_user(monkeypatch_module):
+    """Resolve the JWT subject to ACTIVE_USER_MOCK once for the whole module; tests only stub their CRUD calls"""
+    monkeypatch_module.setattr(dependencies.crud_user, "get_user_by_username", lambda *args, **kwargs: ACTIVE_USER_MOCK)
 
 
 class TestGetKeywords:
@@ -15,52 +65,29 @@ class TestGetKeywords:
     Test cases for GET /api/v1/me/keywords/ endpoint
     """
 
-    @pytest.mark.asyncio
-    async def test_get_keywords_for_new_user_should_return_empty_list(self, async_client: AsyncClient, mocker):
+    @pytest.mark.parametrize("stored_keywords, expected", [
+        ((), []),  # KWT-001: A new user has no keywords
+        (PYTHON_FASTAPI_TEST_KEYWORDS, ["Python", "FastAPI", "測試"]),  # KWT-002
+    ], ids=["KWT-001-empty", "KWT-002-populated"])
+    async def test_get_keywords_should_return_user_keywords_list(self, async_client: AsyncClient, auth_headers, set_attrs, stored_keywords, expected):
         """
-        Test KWT-001: Getting keywords for a new user should return empty list
+        Test KWT-001/KWT-002: Getting keywords should return the user's keywords list,
+        which is empty for a new user
         """
         # Arrange
-        mocker.patch("dependencies.crud_user.get_user_by_username", return_value=ACTIVE_USER_MOCK)
-        mocker.patch("app.api.v1.endpoints.keywords.crud_keyword.get_by_user_id", return_value=[])
+        set_attrs(keywords.crud_keyword, get_by_user_id=returns(stored_keywords))
 
         # Act
-        response = await async_client.get("/api/v1/me/keywords/", headers=get_auth_headers())
+        response = await async_client.get("/api/v1/me/keywords/", headers=auth_headers)
 
         # Assert
         assert response.status_code == 200
         data = response.json()
         assert data["success"] is True
         assert data["message"] == "查詢成功"
-        assert data["data"] == []
+        assert data["data"] == expected
         assert data["error_code"] is None
 
-    @pytest.mark.asyncio
-    async def test_get_keywords_should_return_user_keywords_list(self, async_client: AsyncClient, mocker):
-        """
-        Test KWT-002: Getting keywords should return user's keywords list
-        """
-        # Arrange
-        mocker.patch("dependencies.crud_user.get_user_by_username", return_value=ACTIVE_USER_MOCK)
-        mock_keywords = [
-            MockKeyword(keyword="Python"),
-            MockKeyword(keyword="FastAPI"),
-            MockKeyword(keyword="測試")
-        ]
-        mocker.patch("app.api.v1.endpoints.keywords.crud_keyword.get_by_user_id", return_value=mock_keywords)
-
-        # Act
-        response = await async_client.get("/api/v1/me/keywords/", headers=get_auth_headers())
-
-        # Assert
-        assert response.status_code == 200
-        data = response.json()
-        assert data["success"] is True
-        assert data["message"] == "查詢成功"
-        assert data["data"] == ["Python", "FastAPI", "測試"]
-        assert data["error_code"] is None
-
-    @pytest.mark.asyncio
     async def test_get_keywords_without_token_should_fail(self, async_client: AsyncClient):
         """
         Test KWT-003: Getting keywords without authentication should fail
@@ -77,24 +104,18 @@ class TestUpdateKeywords:
     Test cases for PUT /api/v1/me/keywords/ endpoint
     """
 
-    @pytest.mark.asyncio
-    async def test_update_keywords_with_put_should_replace_all_keywords(self, async_client: AsyncClient, mocker):
+    async def test_update_keywords_with_put_should_replace_all_keywords(self, async_client: AsyncClient, auth_headers, set_attrs):
         """
         Test KWT-004: PUT should completely replace user's keywords list
         """
         # Arrange
-        mocker.patch("dependencies.crud_user.get_user_by_username", return_value=ACTIVE_USER_MOCK)
-        updated_keywords = [
-            MockKeyword(keyword="Python"),
-            MockKeyword(keyword="FastAPI")
-        ]
-        mocker.patch("app.api.v1.endpoints.keywords.crud_keyword.sync_for_user", return_value=updated_keywords)
+        set_attrs(keywords.crud_keyword, sync_for_user=returns(PYTHON_FASTAPI_KEYWORDS))
 
         # Act
         response = await async_client.put(
             "/api/v1/me/keywords/", 
             json=["Python", "FastAPI"],
-            headers=get_auth_headers()
+            headers=auth_headers
         )
 
         # Assert
@@ -105,54 +126,44 @@ class TestUpdateKeywords:
         assert data["data"] == ["Python", "FastAPI"]
         assert data["error_code"] is None
 
-    @pytest.mark.asyncio
-    async def test_update_keywords_is_idempotent(self, async_client: AsyncClient, mocker):
+    async def test_update_keywords_is_idempotent(self, async_client: AsyncClient, auth_headers, set_attrs):
         """
         Test KWT-005: PUT operations should be idempotent
+        The CRUD layer is stubbed, so a second identical request could only echo the stub;
+        instead assert the contract that makes PUT idempotent: the full list is handed to
+        sync_for_user as a replacement, not appended.
         """
         # Arrange
-        mocker.patch("dependencies.crud_user.get_user_by_username", return_value=ACTIVE_USER_MOCK)
-        keywords = [MockKeyword(keyword="React")]
-        mocker.patch("app.api.v1.endpoints.keywords.crud_keyword.sync_for_user", return_value=keywords)
+        sync_for_user = MagicMock(return_value=REACT_KEYWORDS)
+        set_attrs(keywords.crud_keyword, sync_for_user=sync_for_user)
 
-        # Act - 執行兩次相同的請求
-        response1 = await async_client.put(
-            "/api/v1/me/keywords/", 
-            json=["React"],
-            headers=get_auth_headers()
-        )
-        response2 = await async_client.put(
+        # Act
+        response = await async_client.put(
             "/api/v1/me/keywords/", 
             json=["React"],
-            headers=get_auth_headers()
+            headers=auth_headers
         )
 
-        # Assert - 兩次結果應該相同
-        assert response1.status_code == 200
-        assert response2.status_code == 200
-        data1 = response1.json()
-        data2 = response2.json()
-        assert data1["success"] is True
-        assert data2["success"] is True
-        assert data1["message"] == "關鍵字更新成功"
-        assert data2["message"] == "關鍵字更新成功"
-        assert data1["data"] == ["React"]
-        assert data2["data"] == ["React"]
-
-    @pytest.mark.asyncio
-    async def test_update_keywords_with_empty_list_should_clear_all(self, async_client: AsyncClient, mocker):
+        # Assert
+        assert response.status_code == 200
+        data = response.json()
+        assert data["success"] is True
+        assert data["message"] == "關鍵字更新成功"
+        assert data["data"] == ["React"]
+        sync_for_user.assert_called_once_with(db=FAKE_DB, user_id=ACTIVE_USER_MOCK.id, keywords=["React"])
+
+    async def test_update_keywords_with_empty_list_should_clear_all(self, async_client: AsyncClient, auth_headers, set_attrs):
         """
         Test KWT-006: PUT with empty list should clear all keywords
         """
         # Arrange
-        mocker.patch("dependencies.crud_user.get_user_by_username", return_value=ACTIVE_USER_MOCK)
-        mocker.patch("app.api.v1.endpoints.keywords.crud_keyword.sync_for_user", return_value=[])
+        set_attrs(keywords.crud_keyword, sync_for_user=returns([]))
 
         # Act
         response = await async_client.put(
             "/api/v1/me/keywords/", 
             json=[],
-            headers=get_auth_headers()
+            headers=auth_headers
         )
 
         # Assert
@@ -163,7 +174,6 @@ class TestUpdateKeywords:
         assert data["data"] == []
         assert data["error_code"] is None
 
-    @pytest.mark.asyncio
     async def test_update_keywords_without_token_should_fail(self, async_client: AsyncClient):
         """
         Test KWT-007: PUT keywords without authentication should fail
@@ -174,42 +184,16 @@ class TestUpdateKeywords:
         # Assert
         assert response.status_code == 403  # 沒有 Token 會回傳 403 Forbidden
 
-    @pytest.mark.asyncio
-    async def test_update_keywords_with_invalid_json_should_fail(self, async_client: AsyncClient, mocker):
+    async def test_update_keywords_with_invalid_json_should_fail(self, async_client: AsyncClient, auth_headers):
         """
         Test KWT-008: PUT with invalid JSON should return validation error
         """
-        # Arrange
-        mocker.patch("dependencies.crud_user.get_user_by_username", return_value=ACTIVE_USER_MOCK)
-
         # Act - 發送無效的 JSON 結構（應該是字串列表，但送了字典）
         response = await async_client.put(
             "/api/v1/me/keywords/", 
             json={"invalid": "format"},
-            headers=get_auth_headers()
+            headers=auth_headers
         )
 
         # Assert
         assert response.status_code == 400  # 資料驗證錯誤
-
-
-# Test fixtures and helpers
-class MockKeyword:
-    def __init__(self, keyword: str):
-        self.keyword = keyword
-
-
-class MockUser:
-    def __init__(self, id: int, username: str, is_active: bool = True):
-        self.id = id
-        self.username = username
-        self.is_active = is_active
-
-
-ACTIVE_USER_MOCK = MockUser(id=1, username="test@example.com", is_active=True)
-
-
-def get_auth_headers(user_id: int = 1):
-    """Get authentication headers for testing"""
-    token = create_access_token(subject=str(user_id))
-    return {"Authorization": f"Bearer {token}"} 
\ No newline at end of file
@@ -1,7 +1,7 @@
-from httpx import AsyncClient
+from fastapi.testclient import TestClient
 
 
-async def test_root_endpoint(async_client: AsyncClient):
+def test_root_endpoint(sync_client: TestClient):
     """
     Tests the root endpoint ("/") of the application.
 
@@ -10,7 +10,7 @@ async def test_root_endpoint(async_client: AsyncClient):
     2. The response JSON matches the expected welcome message.
     """
     # When: a GET request is made to the root endpoint
-    response = await async_client.get("/")
+    response = sync_client.get("/")
 
     # Then: the response should be successful and contain the welcome message
     assert response.status_code == 200
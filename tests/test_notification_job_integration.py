@@ -1,7 +1,8 @@
 import pytest
 import asyncio
-from unittest.mock import patch, MagicMock, AsyncMock
+from unittest.mock import patch, MagicMock, AsyncMock, DEFAULT
 from datetime import datetime
+from types import SimpleNamespace
 from scheduler.job_manager import (
     execute_notification_job,
     trigger_notification_job,
@@ -9,6 +10,33 @@ from scheduler.job_manager import (
     _execute_notification_with_retry
 )
 from app.jobs.notification_job import process_and_notify_users
+from scheduler import job_manager
+from scheduler.job_scheduler import SchedulerManager
+from core.config import settings
+
+
+# Pre-built exceptions raised by the failing processor stubs
+NOTIFICATION_ERROR = Exception("Test notification error")
+PERSISTENT_NOTIFICATION_ERROR = Exception("Persistent notification error")
+
+
+@pytest.fixture(scope="module")
+def _sleep_stub(monkeypatch_module):
+    """
+    Replace the asyncio module seen by scheduler.job_manager once per module, so retry
+    waits return immediately. Only job_manager's reference is swapped; the real
+    asyncio.sleep used by the event loop and other modules is left alone.
+    """
+    sleep = AsyncMock()
+    monkeypatch_module.setattr(job_manager, "asyncio", SimpleNamespace(sleep=sleep))
+    return sleep
+
+
+@pytest.fixture(autouse=True)
+def fast_sleep(_sleep_stub):
+    """Hand each test the module-wide sleep stub with its call history cleared"""
+    _sleep_stub.reset_mock()
+    return _sleep_stub
 
 
 class TestNotificationJobIntegration:
@@ -16,14 +44,19 @@ class TestNotificationJobIntegration:
     Test suite for notification job integration with APScheduler
     """
     
-    @pytest.mark.asyncio
     async def test_execute_notification_job_success(self):
         """
         Test successful execution of notification job
         """
-        with patch('scheduler.job_manager.get_db') as mock_get_db, \
-             patch('scheduler.job_manager.crud_job_execution_history') as mock_crud, \
-             patch('scheduler.job_manager._call_notification_processor') as mock_processor:
+        with patch.multiple(
+            'scheduler.job_manager',
+            get_db=DEFAULT,
+            crud_job_execution_history=DEFAULT,
+            _call_notification_processor=DEFAULT,
+        ) as mocks:
+            mock_get_db = mocks['get_db']
+            mock_crud = mocks['crud_job_execution_history']
+            mock_processor = mocks['_call_notification_processor']
             
             # Setup mocks
             mock_db = MagicMock()
@@ -31,8 +64,8 @@ class TestNotificationJobIntegration:
             mock_crud.cleanup_old_records.return_value = 0
             mock_crud.is_job_paused.return_value = False
             mock_crud.get_consecutive_failures.return_value = 0
-            mock_crud.create.return_value = MagicMock()
-            mock_crud.update.return_value = MagicMock()
+            mock_crud.create.return_value = SimpleNamespace()
+            mock_crud.update.return_value = SimpleNamespace()
             
             # Mock successful processor execution
             mock_processor.return_value = {
@@ -50,13 +83,17 @@ class TestNotificationJobIntegration:
             mock_crud.get_consecutive_failures.assert_called_once_with(mock_db, job_name="notification_processor")
             mock_processor.assert_called_once()
     
-    @pytest.mark.asyncio
     async def test_execute_notification_job_paused(self):
         """
         Test notification job execution when job is paused
         """
-        with patch('scheduler.job_manager.get_db') as mock_get_db, \
-             patch('scheduler.job_manager.crud_job_execution_history') as mock_crud:
+        with patch.multiple(
+            'scheduler.job_manager',
+            get_db=DEFAULT,
+            crud_job_execution_history=DEFAULT,
+        ) as mocks:
+            mock_get_db = mocks['get_db']
+            mock_crud = mocks['crud_job_execution_history']
             
             # Setup mocks
             mock_db = MagicMock()
@@ -73,7 +110,6 @@ class TestNotificationJobIntegration:
             # Should not proceed to consecutive failures check
             mock_crud.get_consecutive_failures.assert_not_called()
     
-    @pytest.mark.asyncio
     async def test_call_notification_processor_success(self):
         """
         Test successful call to notification processor
@@ -90,7 +126,6 @@ class TestNotificationJobIntegration:
             assert "notifications_sent" in result
             assert "execution_time" in result
     
-    @pytest.mark.asyncio
     async def test_call_notification_processor_exception(self):
         """
         Test notification processor call with exception
@@ -98,7 +133,7 @@ class TestNotificationJobIntegration:
         with patch('scheduler.job_manager.process_and_notify_users') as mock_process:
             
             # Setup mock to raise exception
-            mock_process.side_effect = Exception("Test notification error")
+            mock_process.side_effect = NOTIFICATION_ERROR
             
             # Execute and expect exception
             with pytest.raises(Exception) as exc_info:
@@ -106,7 +141,6 @@ class TestNotificationJobIntegration:
             
             assert "Test notification error" in str(exc_info.value)
     
-    @pytest.mark.asyncio
     async def test_trigger_notification_job(self):
         """
         Test manual trigger of notification job
@@ -120,19 +154,24 @@ class TestNotificationJobIntegration:
             mock_execute.assert_called_once()
             assert result["message"] == "Notification job execution triggered"
     
-    @pytest.mark.asyncio
     async def test_execute_notification_with_retry_success_first_attempt(self):
         """
         Test notification execution with retry - success on first attempt
         """
-        with patch('scheduler.job_manager.get_db') as mock_get_db, \
-             patch('scheduler.job_manager.crud_job_execution_history') as mock_crud, \
-             patch('scheduler.job_manager._call_notification_processor') as mock_processor:
+        with patch.multiple(
+            'scheduler.job_manager',
+            get_db=DEFAULT,
+            crud_job_execution_history=DEFAULT,
+            _call_notification_processor=DEFAULT,
+        ) as mocks:
+            mock_get_db = mocks['get_db']
+            mock_crud = mocks['crud_job_execution_history']
+            mock_processor = mocks['_call_notification_processor']
             
             # Setup mocks
-            mock_db = MagicMock()
+            mock_db = SimpleNamespace()  # Only passed through to the mocked CRUD layer
             mock_get_db.return_value = mock_db
-            mock_execution_record = MagicMock()
+            mock_execution_record = SimpleNamespace()
             
             # Mock successful processor execution
             mock_processor.return_value = {
@@ -148,44 +187,62 @@ class TestNotificationJobIntegration:
             mock_processor.assert_called_once()
             mock_crud.update.assert_called_once()
     
-    @pytest.mark.asyncio
-    async def test_execute_notification_with_retry_final_failure(self):
+    @pytest.mark.slow
+    async def test_execute_notification_with_retry_final_failure(self, fast_sleep):
         """
         Test notification execution with retry - final failure after max retries
         """
-        with patch('scheduler.job_manager.get_db') as mock_get_db, \
-             patch('scheduler.job_manager.crud_job_execution_history') as mock_crud, \
-             patch('scheduler.job_manager._call_notification_processor') as mock_processor, \
-             patch('scheduler.job_manager._send_notification_failure_notification') as mock_notify, \
-             patch('scheduler.job_manager.settings') as mock_settings, \
-             patch('asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
+        # Processor that always fails; a plain coroutine that counts its own calls
+        # avoids AsyncMock's per-call bookkeeping on every retry
+        processor_calls = []
+
+        async def always_fail():
+            processor_calls.append(None)
+            raise PERSISTENT_NOTIFICATION_ERROR
+
+        with patch.multiple(
+            'scheduler.job_manager',
+            get_db=DEFAULT,
+            crud_job_execution_history=DEFAULT,
+            _call_notification_processor=always_fail,
+            _send_notification_failure_notification=DEFAULT,
+            settings=DEFAULT,
+        ) as mocks:
+            mock_get_db = mocks['get_db']
+            mock_crud = mocks['crud_job_execution_history']
+            mock_notify = mocks['_send_notification_failure_notification']
+            mock_settings = mocks['settings']
             
             # Setup mocks
-            mock_db = MagicMock()
+            mock_db = SimpleNamespace()  # Only passed through to the mocked CRUD layer
             mock_get_db.return_value = mock_db
-            mock_execution_record = MagicMock()
+            mock_execution_record = SimpleNamespace()
             mock_settings.JOB_RETRY_MAX = 2  # Set max retries to 2
             
-            # Mock processor to always fail
-            mock_processor.side_effect = Exception("Persistent notification error")
-            
             # Execute with retry
             await _execute_notification_with_retry(mock_db, mock_execution_record)
             
             # Verify retries and final failure handling
-            assert mock_processor.call_count == 3  # Initial + 2 retries
+            assert len(processor_calls) == 3  # Initial + 2 retries
             mock_crud.update.assert_called_once()  # Final failure update
             mock_notify.assert_called_once()  # Failure notification sent
-            assert mock_sleep.call_count == 2  # Wait between retries
+            assert fast_sleep.call_count == 2  # Wait between retries
     
     def test_process_and_notify_users_mock_execution(self):
         """
         Test the core notification processing function with mocked dependencies
         """
-        with patch('app.jobs.notification_job._get_all_user_settings') as mock_users, \
-             patch('app.jobs.notification_job._get_unprocessed_events') as mock_events, \
-             patch('app.jobs.notification_job._send_email_notifications') as mock_send, \
-             patch('app.jobs.notification_job._update_processed_events') as mock_update:
+        with patch.multiple(
+            'app.jobs.notification_job',
+            _get_all_user_settings=DEFAULT,
+            _get_unprocessed_events=DEFAULT,
+            _send_email_notifications=DEFAULT,
+            _update_processed_events=DEFAULT,
+        ) as mocks:
+            mock_users = mocks['_get_all_user_settings']
+            mock_events = mocks['_get_unprocessed_events']
+            mock_send = mocks['_send_email_notifications']
+            mock_update = mocks['_update_processed_events']
             
             # Setup mock data
             mock_users.return_value = [
@@ -220,8 +277,13 @@ class TestNotificationJobIntegration:
         """
         Test notification processing with no user settings
         """
-        with patch('app.jobs.notification_job._get_all_user_settings') as mock_users, \
-             patch('app.jobs.notification_job._get_unprocessed_events') as mock_events:
+        with patch.multiple(
+            'app.jobs.notification_job',
+            _get_all_user_settings=DEFAULT,
+            _get_unprocessed_events=DEFAULT,
+        ) as mocks:
+            mock_users = mocks['_get_all_user_settings']
+            mock_events = mocks['_get_unprocessed_events']
             
             # Setup empty user settings
             mock_users.return_value = []
@@ -237,9 +299,15 @@ class TestNotificationJobIntegration:
         """
         Test notification processing with no unprocessed events
         """
-        with patch('app.jobs.notification_job._get_all_user_settings') as mock_users, \
-             patch('app.jobs.notification_job._get_unprocessed_events') as mock_events, \
-             patch('app.jobs.notification_job._send_email_notifications') as mock_send:
+        with patch.multiple(
+            'app.jobs.notification_job',
+            _get_all_user_settings=DEFAULT,
+            _get_unprocessed_events=DEFAULT,
+            _send_email_notifications=DEFAULT,
+        ) as mocks:
+            mock_users = mocks['_get_all_user_settings']
+            mock_events = mocks['_get_unprocessed_events']
+            mock_send = mocks['_send_email_notifications']
             
             # Setup mock data
             mock_users.return_value = [{"email_address": "test@example.com", "is_active": True}]
@@ -253,15 +321,22 @@ class TestNotificationJobIntegration:
             mock_events.assert_called_once()
             mock_send.assert_not_called()  # Should not send notifications if no events
     
-    @pytest.mark.asyncio
+    @pytest.mark.slow
     async def test_notification_job_consecutive_failures_pause(self):
         """
         Test notification job pausing after consecutive failures
         """
-        with patch('scheduler.job_manager.get_db') as mock_get_db, \
-             patch('scheduler.job_manager.crud_job_execution_history') as mock_crud, \
-             patch('scheduler.job_manager._pause_notification_job_due_to_failures') as mock_pause, \
-             patch('scheduler.job_manager.settings') as mock_settings:
+        with patch.multiple(
+            'scheduler.job_manager',
+            get_db=DEFAULT,
+            crud_job_execution_history=DEFAULT,
+            _pause_notification_job_due_to_failures=DEFAULT,
+            settings=DEFAULT,
+        ) as mocks:
+            mock_get_db = mocks['get_db']
+            mock_crud = mocks['crud_job_execution_history']
+            mock_pause = mocks['_pause_notification_job_due_to_failures']
+            mock_settings = mocks['settings']
             
             # Setup mocks
             mock_db = MagicMock()
@@ -278,6 +353,15 @@ class TestNotificationJobIntegration:
             mock_pause.assert_called_once_with(mock_db, 3)
 
 
+@pytest.fixture(scope="module")
+def scheduler_manager():
+    """
+    Build one SchedulerManager (APScheduler instance, timezone lookup) per module.
+    It is never started, so no jobs are registered or executed.
+    """
+    return SchedulerManager()
+
+
 class TestNotificationJobConfiguration:
     """
     Test configuration aspects of notification job integration
@@ -287,31 +371,20 @@ class TestNotificationJobConfiguration:
         """
         Test that notification job interval setting is available
         """
-        from core.config import settings
-        
         # Verify the setting exists and has expected default
         assert hasattr(settings, 'NOTIFICATION_JOB_INTERVAL_HOURS')
         assert settings.NOTIFICATION_JOB_INTERVAL_HOURS == 1
     
-    def test_scheduler_job_registration(self):
+    @pytest.mark.slow
+    def test_scheduler_job_registration(self, scheduler_manager):
         """
         Test that notification job is properly registered in scheduler
         This is an integration test that verifies scheduler configuration
         """
-        from scheduler.job_scheduler import SchedulerManager
-        from unittest.mock import patch
-        
-        # Create scheduler instance
-        scheduler_manager = SchedulerManager()
-        
-        # Mock the actual job functions to avoid execution
-        with patch('scheduler.job_manager.execute_corporate_events_job'), \
-             patch('scheduler.job_manager.execute_notification_job'):
-            
-            # This would normally start the scheduler, but we're just testing configuration
-            # In a real test environment, you might want to use a test scheduler
-            assert scheduler_manager.scheduler is not None
-            assert scheduler_manager.scheduler.timezone.zone == 'Asia/Taipei'
+        # This would normally start the scheduler, but we're just testing configuration
+        # In a real test environment, you might want to use a test scheduler
+        assert scheduler_manager.scheduler is not None
+        assert scheduler_manager.scheduler.timezone.zone == 'Asia/Taipei'
 
 
 # Integration test utilities
@@ -14,51 +14,190 @@ The tests follow Test-Driven Development (TDD) methodology and include:
 - Error handling tests
 - Keywords integration tests
 """
+import json
+
 import pytest
+from fastapi import Depends
+from fastapi.testclient import TestClient
+from fastapi.security import HTTPAuthorizationCredentials
 from httpx import AsyncClient
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Optional
 from unittest.mock import MagicMock
 from datetime import datetime
 
+import dependencies
+from app.api.v1.endpoints import notify_settings
 from core.security import create_access_token
 
 
 # --- Test Data Constants ---
 
-ACTIVE_USER_MOCK = MagicMock(
+# One shared timestamp instance for every created_at/updated_at field
+FIXED_DATETIME = datetime(2024, 1, 1, 0, 0, 0)
+
+# Plain attribute records: the endpoints only read these fields, so a
+# SimpleNamespace avoids MagicMock minting child mocks on every access
+ACTIVE_USER_MOCK = SimpleNamespace(
     id=1,
     username="user@example.com",
     password_hash="hashed_password",
     invite_code_used="TESTCODE",
     is_active=True,
-    created_at=datetime(2024, 1, 1, 0, 0, 0),
-    updated_at=datetime(2024, 1, 1, 0, 0, 0)
+    created_at=FIXED_DATETIME,
+    updated_at=FIXED_DATETIME
 )
 
-EMAIL_NOTIFY_SETTING_MOCK = MagicMock(
+
+# Settings returned as plain dicts are validated by the response model, which
+# parses ISO strings as readily as datetime objects
+FIXED_ISO_DATETIME = "2024-01-01T00:00:00"
+
+
+@dataclass(frozen=True, slots=True)
+class NotifySettingStub:
+    """Plain notify-setting record with exactly the fields the response models read"""
+    id: int
+    user_id: int
+    notify_type: str
+    email_address: Optional[str]
+    is_active: bool
+    created_at: datetime
+    updated_at: datetime
+
+
+# Frozen records; tests needing different field values derive them with dataclasses.replace()
+EMAIL_NOTIFY_SETTING_MOCK = NotifySettingStub(
     id=1,
     user_id=1,
     notify_type="email",
     email_address="user@example.com",
     is_active=True,
-    created_at=datetime(2024, 1, 1, 0, 0, 0),
-    updated_at=datetime(2024, 1, 1, 0, 0, 0)
+    created_at=FIXED_DATETIME,
+    updated_at=FIXED_DATETIME
 )
 
-TELEGRAM_NOTIFY_SETTING_MOCK = MagicMock(
+TELEGRAM_NOTIFY_SETTING_MOCK = NotifySettingStub(
     id=2,
     user_id=1,
     notify_type="telegram",
     email_address=None,
     is_active=True,
-    created_at=datetime(2024, 1, 1, 0, 0, 0),
-    updated_at=datetime(2024, 1, 1, 0, 0, 0)
+    created_at=FIXED_DATETIME,
+    updated_at=FIXED_DATETIME
 )
 
+# Keyword rows are read-only in these tests, so one set of records is shared by every test
+KEYWORD_RECORDS = (SimpleNamespace(keyword="keyword1"), SimpleNamespace(keyword="keyword2"))
+NEW_KEYWORD_RECORDS = (SimpleNamespace(keyword="new1"), SimpleNamespace(keyword="new2"))
+
+
+@lru_cache(maxsize=8)
+def _cached_token(user_id: int) -> str:
+    """Sign each distinct user_id only once per module"""
+    return create_access_token(subject=str(user_id))
+
 
 def get_auth_headers(user_id: int = 1) -> dict:
     """Helper function to get authorization headers with JWT token"""
-    token = create_access_token(subject=str(user_id))
-    return {"Authorization": f"Bearer {token}"}
+    return {"Authorization": f"Bearer {_cached_token(user_id)}"}
+
+
+def returns(value):
+    """Helper function to build a stub that ignores its arguments and returns value"""
+    return lambda *args, **kwargs: value
+
+
+def encode_headers(headers: dict) -> tuple:
+    """Helper function to pre-encode headers as the (bytes, bytes) pairs httpx sends on the wire"""
+    return tuple((name.lower().encode(), value.encode()) for name, value in headers.items())
+
+
+# Signed and encoded once at import time; the token is valid far longer than a test run.
+# Shared by every test, so kept as tuples to keep one test from leaking edits into the next.
+AUTH_HEADERS = encode_headers(get_auth_headers())
+JSON_HEADERS = encode_headers({"Content-Type": "application/json"})
+JSON_AUTH_HEADERS = AUTH_HEADERS + JSON_HEADERS
+
+
+# --- Shared Stubs ---
+
+def _active_user(credentials: HTTPAuthorizationCredentials = Depends(dependencies.security)):
+    """Stand-in for get_current_active_user: still requires a Bearer header, but skips JWT decoding and the user lookup"""
+    return ACTIVE_USER_MOCK
+
+
+@pytest.fixture(autouse=True, scope="module")
+def authenticated_user(app):
+    """
+    Authenticate every request carrying a Bearer token as ACTIVE_USER_MOCK for the whole module;
+    tests only configure their CRUD stubs. Requests without a token are still rejected by HTTPBearer.
+    """
+    app.dependency_overrides[dependencies.get_current_active_user] = _active_user
+    yield ACTIVE_USER_MOCK
+    app.dependency_overrides.pop(dependencies.get_current_active_user, None)
+
+
+@pytest.fixture(scope="module")
+def _crud_stub_bank(monkeypatch_module):
+    """
+    Patch the notify setting CRUD functions used by the endpoints once per module.
+    """
+    stubs = SimpleNamespace(
+        get_notify_setting_by_user_and_type=MagicMock(),
+        create_notify_setting=MagicMock(),
+        get_user_notify_settings=MagicMock(),
+        get_settings_with_keywords_by_user_id=MagicMock(),
+        get_notify_setting_by_id=MagicMock(),
+        validate_final_state=MagicMock(),
+        update_notify_setting=MagicMock(),
+        delete_notify_setting=MagicMock(),
+    )
+    for name, stub in vars(stubs).items():
+        monkeypatch_module.setattr(notify_settings.crud_notify_setting, name, stub)
+    return stubs
+
+
+@pytest.fixture(autouse=True)
+def crud_stubs(_crud_stub_bank):
+    """
+    Hand the module-wide stubs to each test with their configuration cleared,
+    so return values set by one test never leak into the next.
+    """
+    for stub in vars(_crud_stub_bank).values():
+        stub.reset_mock(return_value=True, side_effect=True)
+    return _crud_stub_bank
+
+
+# --- Endpoint URLs ---
+
+NOTIFY_SETTINGS_URL = "/api/v1/me/notify-settings/"
+EMAIL_SETTING_URL = f"{NOTIFY_SETTINGS_URL}1"
+TELEGRAM_SETTING_URL = f"{NOTIFY_SETTINGS_URL}2"
+MISSING_SETTING_URL = f"{NOTIFY_SETTINGS_URL}999"
+
+
+# --- Pre-serialized Request Bodies (sent with content= to skip per-request json.dumps) ---
+
+CREATE_EMAIL_WITH_KEYWORDS_BODY = json.dumps({
+    "notify_type": "email",
+    "email_address": "user@example.com",
+    "keywords": ["keyword1", "keyword2"]
+}).encode()
+CREATE_EMAIL_BODY = json.dumps({"notify_type": "email", "email_address": "user@example.com"}).encode()
+CREATE_TELEGRAM_BODY = json.dumps({"notify_type": "telegram"}).encode()
+EMAIL_TYPE_ONLY_BODY = json.dumps({"notify_type": "email"}).encode()
+EMPTY_EMAIL_BODY = json.dumps({"notify_type": "email", "email_address": ""}).encode()
+EMPTY_NOTIFY_TYPE_BODY = json.dumps({"notify_type": "", "email_address": "user@example.com"}).encode()
+UPDATE_EMAIL_BODY = json.dumps({"email_address": "newemail@example.com"}).encode()
+UPDATE_EMAIL_AND_KEYWORDS_BODY = json.dumps({
+    "email_address": "new@example.com",
+    "keywords": ["new1", "new2"]
+}).encode()
+UPDATE_KEYWORDS_BODY = json.dumps({"keywords": ["new1", "new2"]}).encode()
+CLEAR_KEYWORDS_BODY = json.dumps({"keywords": []}).encode()
 
 
 # --- Tests for POST /api/me/notify-settings (Create) ---
@@ -66,26 +205,20 @@ def get_auth_headers(user_id: int = 1) -> dict:
 class TestCreateNotifySetting:
     """Test cases for creating notification settings"""
     
-    @pytest.mark.asyncio
-    async def test_create_email_notify_setting_with_valid_data_should_succeed(self, async_client: AsyncClient, mocker):
+    async def test_create_email_notify_setting_with_valid_data_should_succeed(self, async_client: AsyncClient, crud_stubs, set_attrs):
         """
         Test NST-001: Creating email notification setting with valid email should succeed
         """
         # Arrange
-        mocker.patch("dependencies.crud_user.get_user_by_id", return_value=ACTIVE_USER_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.get_notify_setting_by_user_and_type", return_value=None)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.create_notify_setting", return_value=EMAIL_NOTIFY_SETTING_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.get_by_user_id", return_value=[])
+        crud_stubs.get_notify_setting_by_user_and_type.return_value = None
+        crud_stubs.create_notify_setting.return_value = EMAIL_NOTIFY_SETTING_MOCK
+        set_attrs(notify_settings, get_by_user_id=returns([]))
         
         # Act
         response = await async_client.post(
-            "/api/v1/me/notify-settings/",
-            json={
-                "notify_type": "email", 
-                "email_address": "user@example.com",
-                "keywords": ["keyword1", "keyword2"]
-            },
-            headers=get_auth_headers()
+            NOTIFY_SETTINGS_URL,
+            content=CREATE_EMAIL_WITH_KEYWORDS_BODY,
+            headers=JSON_AUTH_HEADERS
         )
         
         # Assert
@@ -97,22 +230,20 @@ class TestCreateNotifySetting:
         assert "keywords" in data["data"]
         assert isinstance(data["data"]["keywords"], list)
 
-    @pytest.mark.asyncio
-    async def test_create_telegram_notify_setting_without_email_should_succeed(self, async_client: AsyncClient, mocker):
+    async def test_create_telegram_notify_setting_without_email_should_succeed(self, async_client: AsyncClient, crud_stubs, set_attrs):
         """
         Test NST-002: Creating non-email notification setting without email should succeed
         """
         # Arrange
-        mocker.patch("dependencies.crud_user.get_user_by_id", return_value=ACTIVE_USER_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.get_notify_setting_by_user_and_type", return_value=None)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.create_notify_setting", return_value=TELEGRAM_NOTIFY_SETTING_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.get_by_user_id", return_value=[])
+        crud_stubs.get_notify_setting_by_user_and_type.return_value = None
+        crud_stubs.create_notify_setting.return_value = TELEGRAM_NOTIFY_SETTING_MOCK
+        set_attrs(notify_settings, get_by_user_id=returns([]))
         
         # Act
         response = await async_client.post(
-            "/api/v1/me/notify-settings/",
-            json={"notify_type": "telegram"},
-            headers=get_auth_headers()
+            NOTIFY_SETTINGS_URL,
+            content=CREATE_TELEGRAM_BODY,
+            headers=JSON_AUTH_HEADERS
         )
         
         # Assert
@@ -121,19 +252,21 @@ class TestCreateNotifySetting:
         assert data["data"]["notify_type"] == "telegram"
         assert data["data"]["email_address"] is None
 
-    @pytest.mark.asyncio
-    async def test_create_email_notify_setting_without_email_should_fail(self, async_client: AsyncClient, mocker):
+    @pytest.mark.parametrize("body", [
+        EMAIL_TYPE_ONLY_BODY,    # NST-003: no email address
+        EMPTY_EMAIL_BODY,        # NST-004: empty email address
+        EMPTY_NOTIFY_TYPE_BODY,  # NST-005: empty notify_type
+    ], ids=["NST-003-no-email", "NST-004-empty-email", "NST-005-empty-type"])
+    async def test_create_notify_setting_with_invalid_body_should_fail(self, async_client: AsyncClient, body):
         """
-        Test NST-003: Creating email notification without email address should fail
+        Test NST-003/004/005: Creating a notification setting with a missing or empty
+        email address for the email type, or an empty notify_type, should fail
         """
-        # Arrange
-        mocker.patch("dependencies.crud_user.get_user_by_id", return_value=ACTIVE_USER_MOCK)
-        
         # Act
         response = await async_client.post(
-            "/api/v1/me/notify-settings/",
-            json={"notify_type": "email"},
-            headers=get_auth_headers()
+            NOTIFY_SETTINGS_URL,
+            content=body,
+            headers=JSON_AUTH_HEADERS
         )
         
         # Assert
@@ -143,100 +276,39 @@ class TestCreateNotifySetting:
         assert response_data["success"] is False
         assert "參數驗證失敗" in response_data["message"]
 
-    @pytest.mark.asyncio
-    async def test_create_email_notify_setting_with_empty_email_should_fail(self, async_client: AsyncClient, mocker):
-        """
-        Test NST-004: Creating email notification with empty email should fail
-        """
-        # Arrange
-        mocker.patch("dependencies.crud_user.get_user_by_id", return_value=ACTIVE_USER_MOCK)
-        
-        # Act
-        response = await async_client.post(
-            "/api/v1/me/notify-settings/",
-            json={"notify_type": "email", "email_address": ""},
-            headers=get_auth_headers()
-        )
-        
-        # Assert
-        assert response.status_code == 400
-        response_data = response.json()
-        assert response_data["success"] is False
-        assert "參數驗證失敗" in response_data["message"]
-
-    @pytest.mark.asyncio
-    async def test_create_notify_setting_with_empty_notify_type_should_fail(self, async_client: AsyncClient, mocker):
-        """
-        Test NST-005: Creating notification with empty notify_type should fail
-        """
-        # Arrange
-        mocker.patch("dependencies.crud_user.get_user_by_id", return_value=ACTIVE_USER_MOCK)
-        
-        # Act
-        response = await async_client.post(
-            "/api/v1/me/notify-settings/",
-            json={"notify_type": "", "email_address": "user@example.com"},
-            headers=get_auth_headers()
-        )
-        
-        # Assert
-        assert response.status_code == 400
-        response_data = response.json()
-        assert response_data["success"] is False
-        assert "參數驗證失敗" in response_data["message"]
-
-    @pytest.mark.asyncio
-    async def test_create_duplicate_notify_setting_should_fail(self, async_client: AsyncClient, mocker):
+    async def test_create_duplicate_notify_setting_should_fail(self, async_client: AsyncClient, crud_stubs):
         """
         Test NST-006: Creating duplicate notification setting should fail with 409 Conflict
         """
         # Arrange
-        mocker.patch("dependencies.crud_user.get_user_by_id", return_value=ACTIVE_USER_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.get_notify_setting_by_user_and_type", return_value=EMAIL_NOTIFY_SETTING_MOCK)
+        crud_stubs.get_notify_setting_by_user_and_type.return_value = EMAIL_NOTIFY_SETTING_MOCK
         
         # Act
         response = await async_client.post(
-            "/api/v1/me/notify-settings/",
-            json={"notify_type": "email", "email_address": "user@example.com"},
-            headers=get_auth_headers()
+            NOTIFY_SETTINGS_URL,
+            content=CREATE_EMAIL_BODY,
+            headers=JSON_AUTH_HEADERS
         )
         
         # Assert
         assert response.status_code == 409
         assert response.json()["detail"] == "該通知類型的設定已存在"
 
-    @pytest.mark.asyncio
-    async def test_create_notify_setting_without_token_should_fail(self, async_client: AsyncClient):
-        """
-        Test NST-007: Creating notification setting without JWT token should fail
-        """
-        # Act
-        response = await async_client.post(
-            "/api/v1/me/notify-settings/",
-            json={"notify_type": "email", "email_address": "user@example.com"}
-        )
-        
-        # Assert
-        assert response.status_code == 401
-
 
 # --- Tests for GET /api/me/notify-settings (Read - List) ---
 
 class TestGetNotifySettings:
     """Test cases for listing notification settings"""
     
-    @pytest.mark.asyncio
-    async def test_get_user_notify_settings_should_return_list(self, async_client: AsyncClient, mocker):
+    async def test_get_user_notify_settings_should_return_list(self, async_client: AsyncClient, crud_stubs):
         """
         Test NST-008: Getting user's notification settings should return formatted list
         """
         # Arrange
-        mocker.patch("dependencies.crud_user.get_user_by_id", return_value=ACTIVE_USER_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.get_user_notify_settings", 
-                    return_value=([EMAIL_NOTIFY_SETTING_MOCK, TELEGRAM_NOTIFY_SETTING_MOCK], 2))
+        crud_stubs.get_user_notify_settings.return_value = ([EMAIL_NOTIFY_SETTING_MOCK, TELEGRAM_NOTIFY_SETTING_MOCK], 2)
         
         # Act
-        response = await async_client.get("/api/v1/me/notify-settings/", headers=get_auth_headers())
+        response = await async_client.get(NOTIFY_SETTINGS_URL, headers=AUTH_HEADERS)
         
         # Assert
         assert response.status_code == 200
@@ -246,43 +318,29 @@ class TestGetNotifySettings:
         assert data["items"][0]["notify_type"] == "email"
         assert data["items"][1]["notify_type"] == "telegram"
 
-    @pytest.mark.asyncio
-    async def test_get_notify_settings_without_token_should_fail(self, async_client: AsyncClient):
-        """
-        Test NST-009: Getting notification settings without JWT token should fail
-        """
-        # Act
-        response = await async_client.get("/api/v1/me/notify-settings/")
-        
-        # Assert
-        assert response.status_code == 401
-
 
 # --- Tests for PATCH /api/me/notify-settings/{id} (Update) ---
 
 class TestUpdateNotifySetting:
     """Test cases for updating notification settings"""
     
-    @pytest.mark.asyncio
-    async def test_update_notify_setting_valid_data_should_succeed(self, async_client: AsyncClient, mocker):
+    async def test_update_notify_setting_valid_data_should_succeed(self, async_client: AsyncClient, crud_stubs, set_attrs):
         """
         Test NST-010: Updating notification setting with valid data should succeed
         """
         # Arrange
-        updated_setting = MagicMock(**EMAIL_NOTIFY_SETTING_MOCK.__dict__)
-        updated_setting.email_address = "newemail@example.com"
+        updated_setting = replace(EMAIL_NOTIFY_SETTING_MOCK, email_address="newemail@example.com")
         
-        mocker.patch("dependencies.crud_user.get_user_by_id", return_value=ACTIVE_USER_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.get_notify_setting_by_id", return_value=EMAIL_NOTIFY_SETTING_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.validate_final_state", return_value=True)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.update_notify_setting", return_value=updated_setting)
-        mocker.patch("app.api.v1.endpoints.notify_settings.get_by_user_id", return_value=[])
+        crud_stubs.get_notify_setting_by_id.return_value = EMAIL_NOTIFY_SETTING_MOCK
+        crud_stubs.validate_final_state.return_value = True
+        crud_stubs.update_notify_setting.return_value = updated_setting
+        set_attrs(notify_settings, get_by_user_id=returns([]))
         
         # Act
         response = await async_client.patch(
-            "/api/v1/me/notify-settings/1",
-            json={"email_address": "newemail@example.com"},
-            headers=get_auth_headers()
+            EMAIL_SETTING_URL,
+            content=UPDATE_EMAIL_BODY,
+            headers=JSON_AUTH_HEADERS
         )
         
         # Assert
@@ -290,39 +348,23 @@ class TestUpdateNotifySetting:
         data = response.json()
         assert data["data"]["email_address"] == "newemail@example.com"
 
-    @pytest.mark.asyncio
-    async def test_update_notify_setting_with_keywords_replacement_should_succeed(self, async_client: AsyncClient, mocker):
+    async def test_update_notify_setting_with_keywords_replacement_should_succeed(self, async_client: AsyncClient, crud_stubs, set_attrs):
         """
         Test NST-010B: Updating notification setting with keywords replacement should succeed
         """
         # Arrange: First create a setting with old keywords
-        updated_setting = MagicMock(**EMAIL_NOTIFY_SETTING_MOCK.__dict__)
-        updated_setting.email_address = "new@example.com"
-        
-        # Mock old keywords
-        old_keyword_mock = MagicMock()
-        old_keyword_mock.keyword = "old_keyword"
-        
-        # Mock new keywords after update
-        new_keyword_mocks = [
-            MagicMock(keyword="new1"),
-            MagicMock(keyword="new2")
-        ]
+        updated_setting = replace(EMAIL_NOTIFY_SETTING_MOCK, email_address="new@example.com")
         
-        mocker.patch("dependencies.crud_user.get_user_by_id", return_value=ACTIVE_USER_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.get_notify_setting_by_id", return_value=EMAIL_NOTIFY_SETTING_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.validate_final_state", return_value=True)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.update_notify_setting", return_value=updated_setting)
-        mocker.patch("app.api.v1.endpoints.notify_settings.get_by_user_id", return_value=new_keyword_mocks)
+        crud_stubs.get_notify_setting_by_id.return_value = EMAIL_NOTIFY_SETTING_MOCK
+        crud_stubs.validate_final_state.return_value = True
+        crud_stubs.update_notify_setting.return_value = updated_setting
+        set_attrs(notify_settings, get_by_user_id=returns(NEW_KEYWORD_RECORDS))
         
         # Act: Send PUT request with keywords replacement
         response = await async_client.patch(
-            "/api/v1/me/notify-settings/1",
-            json={
-                "email_address": "new@example.com",
-                "keywords": ["new1", "new2"]
-            },
-            headers=get_auth_headers()
+            EMAIL_SETTING_URL,
+            content=UPDATE_EMAIL_AND_KEYWORDS_BODY,
+            headers=JSON_AUTH_HEADERS
         )
         
         # Assert
@@ -332,30 +374,24 @@ class TestUpdateNotifySetting:
         assert "keywords" in data["data"]
         assert data["data"]["keywords"] == ["new1", "new2"]
 
-    @pytest.mark.asyncio
-    async def test_update_notify_setting_clear_keywords_should_succeed(self, async_client: AsyncClient, mocker):
+    async def test_update_notify_setting_clear_keywords_should_succeed(self, async_client: AsyncClient, crud_stubs, set_attrs):
         """
         Test NST-010C: Updating notification setting to clear keywords should succeed
         """
         # Arrange: First create a setting with keywords
-        updated_setting = MagicMock(**EMAIL_NOTIFY_SETTING_MOCK.__dict__)
+        updated_setting = EMAIL_NOTIFY_SETTING_MOCK
         
-        # Mock existing keyword that should be deleted
-        existing_keyword_mock = MagicMock()
-        existing_keyword_mock.keyword = "keyword_to_delete"
-        
-        mocker.patch("dependencies.crud_user.get_user_by_id", return_value=ACTIVE_USER_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.get_notify_setting_by_id", return_value=EMAIL_NOTIFY_SETTING_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.validate_final_state", return_value=True)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.update_notify_setting", return_value=updated_setting)
+        crud_stubs.get_notify_setting_by_id.return_value = EMAIL_NOTIFY_SETTING_MOCK
+        crud_stubs.validate_final_state.return_value = True
+        crud_stubs.update_notify_setting.return_value = updated_setting
         # Mock empty keywords list after clearing
-        mocker.patch("app.api.v1.endpoints.notify_settings.get_by_user_id", return_value=[])
+        set_attrs(notify_settings, get_by_user_id=returns([]))
         
         # Act: Send PUT request with empty keywords array
         response = await async_client.patch(
-            "/api/v1/me/notify-settings/1",
-            json={"keywords": []},
-            headers=get_auth_headers()
+            EMAIL_SETTING_URL,
+            content=CLEAR_KEYWORDS_BODY,
+            headers=JSON_AUTH_HEADERS
         )
         
         # Assert
@@ -364,43 +400,39 @@ class TestUpdateNotifySetting:
         assert "keywords" in data["data"]
         assert data["data"]["keywords"] == []
 
-    @pytest.mark.asyncio
-    async def test_update_nonexistent_notify_setting_should_fail(self, async_client: AsyncClient, mocker):
+    async def test_update_nonexistent_notify_setting_should_fail(self, async_client: AsyncClient, crud_stubs):
         """
         Test NST-011: Updating non-existent notification setting should fail with 404
         """
         # Arrange
-        mocker.patch("dependencies.crud_user.get_user_by_id", return_value=ACTIVE_USER_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.get_notify_setting_by_id", return_value=None)
+        crud_stubs.get_notify_setting_by_id.return_value = None
         
         # Act
         response = await async_client.patch(
-            "/api/v1/me/notify-settings/999",
-            json={"email_address": "newemail@example.com"},
-            headers=get_auth_headers()
+            MISSING_SETTING_URL,
+            content=UPDATE_EMAIL_BODY,
+            headers=JSON_AUTH_HEADERS
         )
         
         # Assert
         assert response.status_code == 404
         assert response.json()["detail"] == "找不到指定的通知設定"
 
-    @pytest.mark.asyncio
-    async def test_update_email_type_to_empty_email_should_fail(self, async_client: AsyncClient, mocker):
+    async def test_update_email_type_to_empty_email_should_fail(self, async_client: AsyncClient, crud_stubs):
         """
         Test NST-012: Updating to email type with empty email should fail
         """
         # Arrange
-        setting_without_email = MagicMock(**TELEGRAM_NOTIFY_SETTING_MOCK.__dict__)
+        setting_without_email = TELEGRAM_NOTIFY_SETTING_MOCK
         
-        mocker.patch("dependencies.crud_user.get_user_by_id", return_value=ACTIVE_USER_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.get_notify_setting_by_id", return_value=setting_without_email)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.validate_final_state", return_value=False)
+        crud_stubs.get_notify_setting_by_id.return_value = setting_without_email
+        crud_stubs.validate_final_state.return_value = False
         
         # Act
         response = await async_client.patch(
-            "/api/v1/me/notify-settings/2",
-            json={"notify_type": "email"},
-            headers=get_auth_headers()
+            TELEGRAM_SETTING_URL,
+            content=EMAIL_TYPE_ONLY_BODY,
+            headers=JSON_AUTH_HEADERS
         )
         
         # Assert
@@ -413,142 +445,103 @@ class TestUpdateNotifySetting:
 class TestDeleteNotifySetting:
     """Test cases for deleting notification settings"""
     
-    @pytest.mark.asyncio
-    async def test_delete_existing_notify_setting_should_succeed(self, async_client: AsyncClient, mocker):
+    async def test_delete_existing_notify_setting_should_succeed(self, async_client: AsyncClient, crud_stubs):
         """
         Test NST-013: Deleting existing notification setting should succeed with 200
         """
         # Arrange
-        mocker.patch("dependencies.crud_user.get_user_by_id", return_value=ACTIVE_USER_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.delete_notify_setting", return_value=True)
+        crud_stubs.delete_notify_setting.return_value = True
         
         # Act
-        response = await async_client.delete("/api/v1/me/notify-settings/1", headers=get_auth_headers())
+        response = await async_client.delete(EMAIL_SETTING_URL, headers=AUTH_HEADERS)
         
         # Assert
         assert response.status_code == 200
 
-    @pytest.mark.asyncio
-    async def test_delete_nonexistent_notify_setting_should_fail(self, async_client: AsyncClient, mocker):
+    async def test_delete_nonexistent_notify_setting_should_fail(self, async_client: AsyncClient, crud_stubs):
         """
         Test NST-014: Deleting non-existent notification setting should fail with 404
         """
         # Arrange
-        mocker.patch("dependencies.crud_user.get_user_by_id", return_value=ACTIVE_USER_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.delete_notify_setting", return_value=False)
+        crud_stubs.delete_notify_setting.return_value = False
         
         # Act
-        response = await async_client.delete("/api/v1/me/notify-settings/999", headers=get_auth_headers())
+        response = await async_client.delete(MISSING_SETTING_URL, headers=AUTH_HEADERS)
         
         # Assert
         assert response.status_code == 404
         assert response.json()["detail"] == "找不到指定的通知設定"
 
-    @pytest.mark.asyncio
-    async def test_delete_notify_setting_without_token_should_fail(self, async_client: AsyncClient):
+
+# --- Tests for Authorization (all methods) ---
+
+class TestNotifySettingWithoutToken:
+    """Test cases for calling the notification settings endpoints without a JWT token"""
+
+    def test_notify_setting_without_token_should_fail(self, sync_client: TestClient):
         """
-        Test NST-015: Deleting notification setting without JWT token should fail
+        Test NST-007/009/015: Creating, listing or deleting notification settings without JWT token should fail.
+        Every request is rejected by HTTPBearer before any awaitable endpoint code runs,
+        so the plain synchronous client is enough.
         """
-        # Act
-        response = await async_client.delete("/api/v1/me/notify-settings/1")
-        
-        # Assert
-        assert response.status_code == 401
+        for method, url, body in (
+            ("POST", NOTIFY_SETTINGS_URL, CREATE_EMAIL_BODY),
+            ("GET", NOTIFY_SETTINGS_URL, None),
+            ("DELETE", EMAIL_SETTING_URL, None),
+        ):
+            # Act
+            response = sync_client.request(
+                method,
+                url,
+                content=body,
+                headers=JSON_HEADERS if body else None
+            )
+            
+            # Assert
+            assert response.status_code == 401, method
 
 
 # --- Tests for Keywords Integration ---
 
+# (id, notify_type, email_address) of the settings listed by the keywords tests, in response order
+KEYWORD_SETTING_ROWS = (
+    (1, "email", "user@example.com"),
+    (2, "telegram", None),
+)
+
+
 class TestNotifySettingsWithKeywords:
     """Test cases for notification settings with keywords integration"""
     
-    @pytest.mark.asyncio
-    async def test_get_notify_settings_should_include_keywords(self, async_client: AsyncClient, mocker):
+    @pytest.mark.parametrize("keywords, total", [
+        (["Python", "FastAPI"], 2),  # NST-016: keywords included in each setting
+        ([], 1),                     # NST-017: empty keywords list for users with no keywords
+    ], ids=["NST-016-with-keywords", "NST-017-no-keywords"])
+    async def test_get_notify_settings_should_include_keywords(self, async_client: AsyncClient, crud_stubs, keywords, total):
         """
-        Test NST-016: GET notify-settings should include user's keywords in each setting
+        Test NST-016/017: GET notify-settings should include the user's keywords in each
+        setting, and an empty keywords list for users with no keywords
         """
         # Arrange
-        mocker.patch("dependencies.crud_user.get_user_by_username", return_value=ACTIVE_USER_MOCK)
-        
         # Mock notify settings with keywords
         notify_settings_with_keywords = [
             {
-                "id": 1,
-                "user_id": 1,
-                "notify_type": "email",
-                "email_address": "user@example.com",
-                "is_active": True,
-                "created_at": datetime(2024, 1, 1, 0, 0, 0),
-                "updated_at": datetime(2024, 1, 1, 0, 0, 0),
-                "keywords": ["Python", "FastAPI"]
-            },
-            {
-                "id": 2,
-                "user_id": 1,
-                "notify_type": "telegram",
-                "email_address": None,
-                "is_active": True,
-                "created_at": datetime(2024, 1, 1, 0, 0, 0),
-                "updated_at": datetime(2024, 1, 1, 0, 0, 0),
-                "keywords": ["Python", "FastAPI"]
-            }
-        ]
-        
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.get_settings_with_keywords_by_user_id", 
-                    return_value=(notify_settings_with_keywords, 2))
-        
-        # Act
-        response = await async_client.get("/api/v1/me/notify-settings/", headers=get_auth_headers())
-        
-        # Assert
-        assert response.status_code == 200
-        response_data = response.json()
-        assert response_data["success"] is True
-        
-        data = response_data["data"]
-        assert data["total"] == 2
-        assert len(data["items"]) == 2
-        
-        # Check first setting
-        first_setting = data["items"][0]
-        assert first_setting["notify_type"] == "email"
-        assert first_setting["email_address"] == "user@example.com"
-        assert "keywords" in first_setting
-        assert first_setting["keywords"] == ["Python", "FastAPI"]
-        
-        # Check second setting
-        second_setting = data["items"][1]
-        assert second_setting["notify_type"] == "telegram"
-        assert second_setting["email_address"] is None
-        assert "keywords" in second_setting
-        assert second_setting["keywords"] == ["Python", "FastAPI"]
-
-    @pytest.mark.asyncio
-    async def test_get_notify_settings_with_no_keywords_should_include_empty_keywords(self, async_client: AsyncClient, mocker):
-        """
-        Test NST-017: GET notify-settings should include empty keywords list for users with no keywords
-        """
-        # Arrange
-        mocker.patch("dependencies.crud_user.get_user_by_username", return_value=ACTIVE_USER_MOCK)
-        
-        # Mock notify settings with empty keywords
-        notify_settings_with_keywords = [
-            {
-                "id": 1,
+                "id": setting_id,
                 "user_id": 1,
-                "notify_type": "email",
-                "email_address": "user@example.com",
+                "notify_type": notify_type,
+                "email_address": email_address,
                 "is_active": True,
-                "created_at": datetime(2024, 1, 1, 0, 0, 0),
-                "updated_at": datetime(2024, 1, 1, 0, 0, 0),
-                "keywords": []
+                "created_at": FIXED_ISO_DATETIME,
+                "updated_at": FIXED_ISO_DATETIME,
+                "keywords": keywords
             }
+            for setting_id, notify_type, email_address in KEYWORD_SETTING_ROWS[:total]
         ]
         
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.get_settings_with_keywords_by_user_id", 
-                    return_value=(notify_settings_with_keywords, 1))
+        crud_stubs.get_settings_with_keywords_by_user_id.return_value = (notify_settings_with_keywords, total)
         
         # Act
-        response = await async_client.get("/api/v1/me/notify-settings/", headers=get_auth_headers())
+        response = await async_client.get(NOTIFY_SETTINGS_URL, headers=AUTH_HEADERS)
         
         # Assert
         assert response.status_code == 200
@@ -556,12 +549,15 @@ class TestNotifySettingsWithKeywords:
         assert response_data["success"] is True
         
         data = response_data["data"]
-        assert data["total"] == 1
-        assert len(data["items"]) == 1
+        assert data["total"] == total
+        assert len(data["items"]) == total
         
-        setting = data["items"][0]
-        assert "keywords" in setting
-        assert setting["keywords"] == []
+        # Check every setting
+        for (_, notify_type, email_address), setting in zip(KEYWORD_SETTING_ROWS, data["items"]):
+            assert setting["notify_type"] == notify_type
+            assert setting["email_address"] == email_address
+            assert "keywords" in setting
+            assert setting["keywords"] == keywords
 
 
 # --- New Tests for Keywords Functionality ---
@@ -569,31 +565,20 @@ class TestNotifySettingsWithKeywords:
 class TestKeywordsFunctionality:
     """Test cases specifically for keywords functionality in notification settings"""
     
-    @pytest.mark.asyncio
-    async def test_create_notify_setting_with_keywords_should_succeed(self, async_client: AsyncClient, mocker):
+    async def test_create_notify_setting_with_keywords_should_succeed(self, async_client: AsyncClient, crud_stubs, set_attrs):
         """
         Test NST-018: Creating notification setting with keywords should succeed
         """
         # Arrange
-        keyword_mocks = [
-            MagicMock(keyword="keyword1"),
-            MagicMock(keyword="keyword2")
-        ]
-        
-        mocker.patch("dependencies.crud_user.get_user_by_id", return_value=ACTIVE_USER_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.get_notify_setting_by_user_and_type", return_value=None)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.create_notify_setting", return_value=EMAIL_NOTIFY_SETTING_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.get_by_user_id", return_value=keyword_mocks)
+        crud_stubs.get_notify_setting_by_user_and_type.return_value = None
+        crud_stubs.create_notify_setting.return_value = EMAIL_NOTIFY_SETTING_MOCK
+        set_attrs(notify_settings, get_by_user_id=returns(KEYWORD_RECORDS))
         
         # Act
         response = await async_client.post(
-            "/api/v1/me/notify-settings/",
-            json={
-                "notify_type": "email",
-                "email_address": "user@example.com",
-                "keywords": ["keyword1", "keyword2"]
-            },
-            headers=get_auth_headers()
+            NOTIFY_SETTINGS_URL,
+            content=CREATE_EMAIL_WITH_KEYWORDS_BODY,
+            headers=JSON_AUTH_HEADERS
         )
         
         # Assert
@@ -602,29 +587,23 @@ class TestKeywordsFunctionality:
         assert "keywords" in data["data"]
         assert data["data"]["keywords"] == ["keyword1", "keyword2"]
 
-    @pytest.mark.asyncio
-    async def test_update_notify_setting_replace_keywords_should_succeed(self, async_client: AsyncClient, mocker):
+    async def test_update_notify_setting_replace_keywords_should_succeed(self, async_client: AsyncClient, crud_stubs, set_attrs):
         """
         Test NST-019: Updating notification setting to replace keywords should succeed
         """
         # Arrange
-        updated_setting = MagicMock(**EMAIL_NOTIFY_SETTING_MOCK.__dict__)
-        new_keyword_mocks = [
-            MagicMock(keyword="new1"),
-            MagicMock(keyword="new2")
-        ]
+        updated_setting = EMAIL_NOTIFY_SETTING_MOCK
         
-        mocker.patch("dependencies.crud_user.get_user_by_id", return_value=ACTIVE_USER_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.get_notify_setting_by_id", return_value=EMAIL_NOTIFY_SETTING_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.validate_final_state", return_value=True)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.update_notify_setting", return_value=updated_setting)
-        mocker.patch("app.api.v1.endpoints.notify_settings.get_by_user_id", return_value=new_keyword_mocks)
+        crud_stubs.get_notify_setting_by_id.return_value = EMAIL_NOTIFY_SETTING_MOCK
+        crud_stubs.validate_final_state.return_value = True
+        crud_stubs.update_notify_setting.return_value = updated_setting
+        set_attrs(notify_settings, get_by_user_id=returns(NEW_KEYWORD_RECORDS))
         
         # Act
         response = await async_client.patch(
-            "/api/v1/me/notify-settings/1",
-            json={"keywords": ["new1", "new2"]},
-            headers=get_auth_headers()
+            EMAIL_SETTING_URL,
+            content=UPDATE_KEYWORDS_BODY,
+            headers=JSON_AUTH_HEADERS
         )
         
         # Assert
@@ -632,30 +611,3 @@ class TestKeywordsFunctionality:
         data = response.json()
         assert "keywords" in data["data"]
         assert data["data"]["keywords"] == ["new1", "new2"]
-
-    @pytest.mark.asyncio
-    async def test_update_notify_setting_clear_keywords_with_empty_array_should_succeed(self, async_client: AsyncClient, mocker):
-        """
-        Test NST-020: Updating notification setting to clear all keywords with empty array should succeed
-        """
-        # Arrange
-        updated_setting = MagicMock(**EMAIL_NOTIFY_SETTING_MOCK.__dict__)
-        
-        mocker.patch("dependencies.crud_user.get_user_by_id", return_value=ACTIVE_USER_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.get_notify_setting_by_id", return_value=EMAIL_NOTIFY_SETTING_MOCK)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.validate_final_state", return_value=True)
-        mocker.patch("app.api.v1.endpoints.notify_settings.crud_notify_setting.update_notify_setting", return_value=updated_setting)
-        mocker.patch("app.api.v1.endpoints.notify_settings.get_by_user_id", return_value=[])
-        
-        # Act
-        response = await async_client.patch(
-            "/api/v1/me/notify-settings/1",
-            json={"keywords": []},
-            headers=get_auth_headers()
-        )
-        
-        # Assert
-        assert response.status_code == 200
-        data = response.json()
-        assert "keywords" in data["data"]
-        assert data["data"]["keywords"] == []
\ No newline at end of file
@@ -13,39 +13,70 @@ The naming convention is: test_{functionality}_{scenario}_should_{expected_outco
 """
 import pytest
 from httpx import AsyncClient
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
 from fastapi import HTTPException
-from datetime import datetime, timedelta
+from fastapi.responses import JSONResponse
+from datetime import datetime
 from jose import jwt
 
-from core.security import create_access_token
+from core.security import create_access_token, verify_and_decode_token
 from core.config import settings
 
 
 # --- Test Data Constants ---
-# Mock user objects for different test scenarios
 
-ACTIVE_USER_MOCK = MagicMock(
+# One shared timestamp instance for every created_at/updated_at field
+FIXED_DATETIME = datetime(2024, 1, 1, 0, 0, 0)
+
+# Plain user records for different test scenarios; the auth dependency only
+# reads their fields, so a SimpleNamespace stands in for a MagicMock
+
+ACTIVE_USER_MOCK = SimpleNamespace(
     id=1,
     username="active@user.com",
     password_hash="hashed_password",
     invite_code_used="TESTCODE",
     is_active=True,
-    created_at=datetime(2024, 1, 1, 0, 0, 0),
-    updated_at=datetime(2024, 1, 1, 0, 0, 0)
+    created_at=FIXED_DATETIME,
+    updated_at=FIXED_DATETIME
 )
 
-INACTIVE_USER_MOCK = MagicMock(
+INACTIVE_USER_MOCK = SimpleNamespace(
     id=2,
     username="inactive@user.com",
     password_hash="hashed_password",
     invite_code_used="TESTCODE",
     is_active=False,
-    created_at=datetime(2024, 1, 1, 0, 0, 0),
-    updated_at=datetime(2024, 1, 1, 0, 0, 0)
+    created_at=FIXED_DATETIME,
+    updated_at=FIXED_DATETIME
 )
 
 
+# --- Invalid Tokens ---
+
+# Fixed unix timestamps for the 'exp' claim; jwt.encode takes ints as-is, so no
+# clock read or datetime arithmetic is needed to build an expired or live token
+EXPIRED_EXP = 1
+FAR_FUTURE_EXP = 9999999999
+
+# Nothing in these payloads depends on runtime state, so each token is signed once at import
+EXPIRED_TOKEN = jwt.encode({"sub": "1", "exp": EXPIRED_EXP}, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+INVALID_SIGNATURE_TOKEN = jwt.encode({"sub": "1", "exp": FAR_FUTURE_EXP}, "wrong_secret_key", algorithm=settings.ALGORITHM)
+MISSING_SUB_TOKEN = jwt.encode({"exp": FAR_FUTURE_EXP}, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+# --- Expected Error Details ---
+
+INVALID_TOKEN_DETAIL = "憑證無效或已過期"
+INACTIVE_USER_DETAIL = "使用者帳號已被停用"
+
+
+# --- Expected Response Bodies (rendered once by JSONResponse, compared byte-for-byte) ---
+
+EXPECTED_NOT_AUTHENTICATED = JSONResponse({"detail": "Not authenticated"}).body
+EXPECTED_INACTIVE_USER = JSONResponse({"detail": INACTIVE_USER_DETAIL}).body
+
+
 # --- Part 1.1: Unit Tests for verify_and_decode_token Function ---
 
 class TestVerifyAndDecodeToken:
@@ -53,16 +84,13 @@ class TestVerifyAndDecodeToken:
     Unit tests for the verify_and_decode_token function in core/security.py
     """
     
-    def test_decode_valid_token_should_return_user_id(self, mocker):
+    def test_decode_valid_token_should_return_user_id(self, access_token):
         """
         Test TST-001: A valid, non-expired token should return the user_id from the sub field.
         """
-        # Arrange: Create a valid token for user_id=1
+        # Arrange: access_token is signed once per session for user_id=1
         user_id = 1
-        token = create_access_token(subject=str(user_id))
-        
-        # Import the function that should be implemented
-        from core.security import verify_and_decode_token
+        token = access_token
         
         # Act: Decode the token
         result = verify_and_decode_token(token)
@@ -71,63 +99,22 @@ class TestVerifyAndDecodeToken:
         assert result == user_id
         assert isinstance(result, int)
 
-    def test_decode_expired_token_should_raise_exception(self, mocker):
-        """
-        Test TST-002: An expired token should raise HTTPException with 401 status code.
-        """
-        # Arrange: Create an expired token
-        past_time = datetime.utcnow() - timedelta(hours=1)
-        expired_payload = {
-            "sub": "1",
-            "exp": past_time
-        }
-        expired_token = jwt.encode(expired_payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-        
-        # Import the function
-        from core.security import verify_and_decode_token
-        
-        # Act & Assert: Should raise HTTPException with 401 status
-        with pytest.raises(HTTPException) as exc_info:
-            verify_and_decode_token(expired_token)
-        
-        assert exc_info.value.status_code == 401
-        assert "憑證無效或已過期" in exc_info.value.detail
-
-    def test_decode_invalid_signature_token_should_raise_exception(self, mocker):
+    @pytest.mark.parametrize("token", [
+        EXPIRED_TOKEN,            # TST-002
+        INVALID_SIGNATURE_TOKEN,  # TST-003
+        MISSING_SUB_TOKEN,        # TST-004
+    ], ids=["TST-002-expired", "TST-003-invalid-signature", "TST-004-missing-sub"])
+    def test_decode_invalid_token_should_raise_exception(self, token):
         """
-        Test TST-003: A token with invalid signature should raise HTTPException with 401 status code.
+        Test TST-002/003/004: An expired token, a token with an invalid signature and a token
+        without a 'sub' field should all raise HTTPException with 401 status code.
         """
-        # Arrange: Create a token with wrong secret key
-        wrong_payload = {"sub": "1", "exp": datetime.utcnow() + timedelta(hours=1)}
-        invalid_token = jwt.encode(wrong_payload, "wrong_secret_key", algorithm=settings.ALGORITHM)
-        
-        # Import the function
-        from core.security import verify_and_decode_token
-        
         # Act & Assert: Should raise HTTPException with 401 status
         with pytest.raises(HTTPException) as exc_info:
-            verify_and_decode_token(invalid_token)
+            verify_and_decode_token(token)
         
         assert exc_info.value.status_code == 401
-        assert "憑證無效或已過期" in exc_info.value.detail
-
-    def test_decode_token_with_missing_sub_should_raise_exception(self, mocker):
-        """
-        Test TST-004: A token without 'sub' field should raise HTTPException with 401 status code.
-        """
-        # Arrange: Create a token without 'sub' field
-        payload_without_sub = {"exp": datetime.utcnow() + timedelta(hours=1)}
-        token_without_sub = jwt.encode(payload_without_sub, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-        
-        # Import the function
-        from core.security import verify_and_decode_token
-        
-        # Act & Assert: Should raise HTTPException with 401 status
-        with pytest.raises(HTTPException) as exc_info:
-            verify_and_decode_token(token_without_sub)
-        
-        assert exc_info.value.status_code == 401
-        assert "憑證無效或已過期" in exc_info.value.detail
+        assert INVALID_TOKEN_DETAIL in exc_info.value.detail
 
 
 # --- Part 1.2: Integration Tests for Protected Endpoints ---
@@ -137,20 +124,15 @@ class TestProtectedEndpoints:
     Integration tests for protected API endpoints that require JWT authentication
     """
     
-    @pytest.mark.asyncio
-    async def test_access_protected_endpoint_with_valid_token_should_succeed(self, async_client: AsyncClient, mocker):
+    async def test_access_protected_endpoint_with_valid_token_should_succeed(self, async_client: AsyncClient, auth_headers, mocker):
         """
         Test TST-005: Accessing protected resource with valid token should return user data.
         """
         # Arrange: Mock database to return active user
         mocker.patch("crud.user.get_user_by_id", return_value=ACTIVE_USER_MOCK)
         
-        # Create valid token for user_id=1
-        token = create_access_token(subject="1")
-        headers = {"Authorization": f"Bearer {token}"}
-        
-        # Act: Request protected endpoint
-        response = await async_client.get("/api/v1/users/me", headers=headers)
+        # Act: Request protected endpoint with the session token for user_id=1
+        response = await async_client.get("/api/v1/users/me", headers=auth_headers)
         
         # Assert: Should return 200 OK with user data
         assert response.status_code == 200
@@ -160,7 +142,6 @@ class TestProtectedEndpoints:
         assert data["is_active"] is True
         assert "password_hash" not in data  # Security: password should not be exposed
 
-    @pytest.mark.asyncio
     async def test_access_protected_endpoint_without_token_should_fail(self, async_client: AsyncClient):
         """
         Test TST-006: Accessing protected resource without token should return 401 Unauthorized.
@@ -170,9 +151,8 @@ class TestProtectedEndpoints:
         
         # Assert: Should return 401 Unauthorized
         assert response.status_code == 401
-        assert "Not authenticated" in response.json()["detail"]
+        assert response.content == EXPECTED_NOT_AUTHENTICATED
 
-    @pytest.mark.asyncio
     async def test_access_protected_endpoint_with_inactive_user_token_should_fail(self, async_client: AsyncClient, mocker):
         """
         Test TST-007: Using token of inactive user should return 400 Bad Request.
@@ -189,5 +169,4 @@ class TestProtectedEndpoints:
         
         # Assert: Should return 400 Bad Request for inactive user
         assert response.status_code == 400
-        data = response.json()
-        assert data["detail"] == "使用者帳號已被停用"
\ No newline at end of file
+        assert response.content == EXPECTED_INACTIVE_USER
\ No newline at end of file
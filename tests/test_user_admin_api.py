@@ -12,42 +12,93 @@ to test the API logic in isolation.
 """
 import pytest
 from httpx import AsyncClient
-from unittest.mock import MagicMock
+from dataclasses import dataclass, replace
 from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from app.api.v1.endpoints import admin
+from schemas.user import UserPublic
 
 
 # --- Test Data Constants ---
 
+# Shared timestamp instances for every created_at/updated_at field
+JAN_1_2024 = datetime(2024, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
+JAN_2_2024 = datetime(2024, 1, 2, 0, 0, 0, tzinfo=timezone.utc)
+JAN_15_2024 = datetime(2024, 1, 15, 0, 0, 0, tzinfo=timezone.utc)
+
+
+@dataclass(frozen=True, slots=True)
+class MockUser:
+    """Plain user record; the endpoints only read its fields, so no MagicMock is needed"""
+    id: int
+    username: str
+    invite_code_used: str
+    is_active: bool
+    created_at: datetime
+    updated_at: datetime
+    password_hash: str = "hashed_password"
+
+
 # Mock user objects for testing
-MOCK_ACTIVE_USER = MagicMock(
+MOCK_ACTIVE_USER = MockUser(
     id=1,
     username="active@example.com",
     invite_code_used="WELCOME2024",
     is_active=True,
-    created_at=datetime(2024, 1, 1, 0, 0, 0, tzinfo=timezone.utc),
-    updated_at=datetime(2024, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
+    created_at=JAN_1_2024,
+    updated_at=JAN_1_2024
 )
 
-MOCK_INACTIVE_USER = MagicMock(
+MOCK_INACTIVE_USER = MockUser(
     id=2,
     username="inactive@example.com",
     invite_code_used="WELCOME2024",
     is_active=False,
-    created_at=datetime(2024, 1, 2, 0, 0, 0, tzinfo=timezone.utc),
-    updated_at=datetime(2024, 1, 15, 0, 0, 0, tzinfo=timezone.utc)
+    created_at=JAN_2_2024,
+    updated_at=JAN_15_2024
 )
 
 
+# --- Shared Stubs ---
+
+@pytest.fixture(scope="module")
+def _admin_stub_bank(monkeypatch_module):
+    """
+    Patch the user CRUD functions used by the admin endpoints once per module.
+    """
+    stubs = SimpleNamespace(
+        get_users=MagicMock(),
+        get_user_by_id=MagicMock(),
+        update_user_active_status=MagicMock(),
+        soft_delete_user=MagicMock(),
+    )
+    for name, stub in vars(stubs).items():
+        monkeypatch_module.setattr(admin.crud_user, name, stub)
+    return stubs
+
+
+@pytest.fixture(autouse=True)
+def admin_stubs(_admin_stub_bank):
+    """
+    Hand the module-wide stubs to each test with their configuration cleared,
+    so return values set by one test never leak into the next.
+    """
+    for stub in vars(_admin_stub_bank).values():
+        stub.reset_mock(return_value=True, side_effect=True)
+    return _admin_stub_bank
+
+
 # --- Tests for GET /api/v1/admin/users ---
 
-@pytest.mark.asyncio
-async def test_get_users_success_should_return_200(async_client: AsyncClient, mocker):
+async def test_get_users_success_should_return_200(async_client: AsyncClient, admin_stubs):
     """
     Test successful retrieval of users list.
     """
     # Arrange: Mock the database response
     mock_users = [MOCK_ACTIVE_USER, MOCK_INACTIVE_USER]
-    mocker.patch("app.api.v1.endpoints.admin.crud_user.get_users", return_value=(mock_users, 2))
+    admin_stubs.get_users.return_value = (mock_users, 2)
 
     # Act: Send the list request
     response = await async_client.get("/api/v1/admin/users")
@@ -69,14 +120,13 @@ async def test_get_users_success_should_return_200(async_client: AsyncClient, mo
         assert "password_hash" not in user
 
 
-@pytest.mark.asyncio
-async def test_get_users_with_active_filter_should_return_200(async_client: AsyncClient, mocker):
+async def test_get_users_with_active_filter_should_return_200(async_client: AsyncClient, admin_stubs):
     """
     Test retrieval with active status filter.
     """
     # Arrange: Mock filtering for active users only
     mock_users = [MOCK_ACTIVE_USER]
-    mocker.patch("app.api.v1.endpoints.admin.crud_user.get_users", return_value=(mock_users, 1))
+    admin_stubs.get_users.return_value = (mock_users, 1)
 
     # Act: Send request with filter
     response = await async_client.get("/api/v1/admin/users?is_active=true")
@@ -89,14 +139,13 @@ async def test_get_users_with_active_filter_should_return_200(async_client: Asyn
     assert data["items"][0]["is_active"] is True
 
 
-@pytest.mark.asyncio
-async def test_get_users_with_pagination_should_return_200(async_client: AsyncClient, mocker):
+async def test_get_users_with_pagination_should_return_200(async_client: AsyncClient, admin_stubs):
     """
     Test retrieval with pagination parameters.
     """
     # Arrange: Mock paginated response
     mock_users = [MOCK_ACTIVE_USER]
-    mocker.patch("app.api.v1.endpoints.admin.crud_user.get_users", return_value=(mock_users, 10))
+    admin_stubs.get_users.return_value = (mock_users, 10)
 
     # Act: Send request with pagination
     response = await async_client.get("/api/v1/admin/users?page=2&size=5")
@@ -111,13 +160,12 @@ async def test_get_users_with_pagination_should_return_200(async_client: AsyncCl
 
 # --- Tests for GET /api/v1/admin/users/{id} ---
 
-@pytest.mark.asyncio
-async def test_get_user_by_id_success_should_return_200(async_client: AsyncClient, mocker):
+async def test_get_user_by_id_success_should_return_200(async_client: AsyncClient, admin_stubs):
     """
     Test successful retrieval of a single user.
     """
     # Arrange: Mock the database response
-    mocker.patch("app.api.v1.endpoints.admin.crud_user.get_user_by_id", return_value=MOCK_ACTIVE_USER)
+    admin_stubs.get_user_by_id.return_value = MOCK_ACTIVE_USER
 
     # Act: Send the request
     response = await async_client.get("/api/v1/admin/users/1")
@@ -132,13 +180,12 @@ async def test_get_user_by_id_success_should_return_200(async_client: AsyncClien
     assert "password_hash" not in data
 
 
-@pytest.mark.asyncio
-async def test_get_user_by_id_not_found_should_return_404(async_client: AsyncClient, mocker):
+async def test_get_user_by_id_not_found_should_return_404(async_client: AsyncClient, admin_stubs):
     """
     Test retrieval of non-existent user should return 404.
     """
     # Arrange: Mock that the user doesn't exist
-    mocker.patch("app.api.v1.endpoints.admin.crud_user.get_user_by_id", return_value=None)
+    admin_stubs.get_user_by_id.return_value = None
 
     # Act: Send request for non-existent user
     response = await async_client.get("/api/v1/admin/users/999")
@@ -150,21 +197,17 @@ async def test_get_user_by_id_not_found_should_return_404(async_client: AsyncCli
 
 # --- Tests for PATCH /api/v1/admin/users/{id} ---
 
-@pytest.mark.asyncio
-async def test_update_user_success_should_return_200(async_client: AsyncClient, mocker):
+async def test_update_user_success_should_return_200(async_client: AsyncClient, admin_stubs):
     """
     Test successful update of a user's active status.
     """
     # Arrange: Mock successful update
-    updated_mock = MagicMock(
-        id=1,
-        username="active@example.com",
-        invite_code_used="WELCOME2024",
+    updated_mock = replace(
+        MOCK_ACTIVE_USER,
         is_active=False,  # Changed to inactive
-        created_at=datetime(2024, 1, 1, 0, 0, 0, tzinfo=timezone.utc),
-        updated_at=datetime(2024, 1, 15, 0, 0, 0, tzinfo=timezone.utc)
+        updated_at=JAN_15_2024
     )
-    mocker.patch("app.api.v1.endpoints.admin.crud_user.update_user_active_status", return_value=updated_mock)
+    admin_stubs.update_user_active_status.return_value = updated_mock
 
     # Act: Send the update request
     response = await async_client.patch(
@@ -183,13 +226,12 @@ async def test_update_user_success_should_return_200(async_client: AsyncClient,
     assert "password_hash" not in data
 
 
-@pytest.mark.asyncio
-async def test_update_user_not_found_should_return_404(async_client: AsyncClient, mocker):
+async def test_update_user_not_found_should_return_404(async_client: AsyncClient, admin_stubs):
     """
     Test update of non-existent user should return 404.
     """
     # Arrange: Mock that the user doesn't exist
-    mocker.patch("app.api.v1.endpoints.admin.crud_user.update_user_active_status", return_value=None)
+    admin_stubs.update_user_active_status.return_value = None
 
     # Act: Send update request for non-existent user
     response = await async_client.patch(
@@ -204,7 +246,6 @@ async def test_update_user_not_found_should_return_404(async_client: AsyncClient
     assert response.json() == {"detail": "使用者不存在"}
 
 
-@pytest.mark.asyncio
 async def test_update_user_missing_is_active_should_return_400(async_client: AsyncClient):
     """
     Test update without required is_active field should return 400.
@@ -221,15 +262,13 @@ async def test_update_user_missing_is_active_should_return_400(async_client: Asy
 
 # --- Tests for DELETE /api/v1/admin/users/{id} ---
 
-@pytest.mark.asyncio
-async def test_delete_user_success_should_return_204(async_client: AsyncClient, mocker):
+async def test_delete_user_success_should_return_204(async_client: AsyncClient, admin_stubs):
     """
     Test successful soft deletion of a user.
     """
     # Arrange: Mock successful soft delete
-    deactivated_mock = MagicMock(**MOCK_ACTIVE_USER.__dict__)
-    deactivated_mock.is_active = False
-    mocker.patch("app.api.v1.endpoints.admin.crud_user.soft_delete_user", return_value=deactivated_mock)
+    deactivated_mock = replace(MOCK_ACTIVE_USER, is_active=False)
+    admin_stubs.soft_delete_user.return_value = deactivated_mock
 
     # Act: Send delete request
     response = await async_client.delete("/api/v1/admin/users/1")
@@ -238,13 +277,12 @@ async def test_delete_user_success_should_return_204(async_client: AsyncClient,
     assert response.status_code == 204
 
 
-@pytest.mark.asyncio
-async def test_delete_user_not_found_should_return_404(async_client: AsyncClient, mocker):
+async def test_delete_user_not_found_should_return_404(async_client: AsyncClient, admin_stubs):
     """
     Test deletion of non-existent user should return 404.
     """
     # Arrange: Mock that the user doesn't exist
-    mocker.patch("app.api.v1.endpoints.admin.crud_user.soft_delete_user", return_value=None)
+    admin_stubs.soft_delete_user.return_value = None
 
     # Act: Send delete request for non-existent user
     response = await async_client.delete("/api/v1/admin/users/999")
@@ -256,50 +294,28 @@ async def test_delete_user_not_found_should_return_404(async_client: AsyncClient
 
 # --- Security Tests ---
 
-@pytest.mark.asyncio
-async def test_user_response_should_never_include_password_hash(async_client: AsyncClient, mocker):
+def test_user_response_should_never_include_password_hash():
     """
     Test that all user-related API responses never include password_hash field.
+    Every admin user endpoint serializes through UserPublic, so the invariant is
+    checked once on the schema; the endpoint tests above also assert it per response.
     """
-    # Mock user with password_hash field
-    mock_user_with_password = MagicMock(
-        id=1,
-        username="test@example.com",
-        password_hash="hashed_password_should_not_appear",
-        invite_code_used="WELCOME2024",
-        is_active=True,
-        created_at=datetime(2024, 1, 1, 0, 0, 0, tzinfo=timezone.utc),
-        updated_at=datetime(2024, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
-    )
-    
-    # Test for single user endpoint
-    mocker.patch("app.api.v1.endpoints.admin.crud_user.get_user_by_id", return_value=mock_user_with_password)
-    response = await async_client.get("/api/v1/admin/users/1")
-    assert response.status_code == 200
-    data = response.json()
-    assert "password_hash" not in data
-    
-    # Test for users list endpoint
-    mocker.patch("app.api.v1.endpoints.admin.crud_user.get_users", return_value=([mock_user_with_password], 1))
-    response = await async_client.get("/api/v1/admin/users")
-    assert response.status_code == 200
-    data = response.json()
-    for user in data["items"]:
-        assert "password_hash" not in user
+    # A user record carrying a password_hash value
+    mock_user_with_password = replace(MOCK_ACTIVE_USER, password_hash="hashed_password_should_not_appear")
+
+    # The schema declares no such field and drops it when validating a user record
+    assert "password_hash" not in UserPublic.model_fields
+    assert "password_hash" not in UserPublic.model_validate(mock_user_with_password).model_dump()
 
 
 # --- Edge Cases ---
 
-@pytest.mark.asyncio
-async def test_get_users_empty_list_should_return_200(async_client: AsyncClient, mocker):
+async def test_get_users_empty_list_should_return_200(async_client: AsyncClient, admin_stubs):
     """
     Test retrieval of empty users list should return valid structure.
     """
     # Arrange: Mock empty response
-    mocker.patch(
-        "app.api.v1.endpoints.admin.crud_user.get_users",
-        return_value=([], 0)
-    )
+    admin_stubs.get_users.return_value = ([], 0)
 
     # Act: Send the request
     response = await async_client.get("/api/v1/admin/users")
@@ -312,18 +328,14 @@ async def test_get_users_empty_list_should_return_200(async_client: AsyncClient,
     assert data["pages"] == 1
 
 
-@pytest.mark.asyncio
 async def test_get_users_invalid_page_should_handle_gracefully(
-    async_client: AsyncClient, mocker
+    async_client: AsyncClient, admin_stubs
 ):
     """
     Test handling of invalid pagination parameters.
     """
     # Arrange: Mock empty response for invalid page
-    mocker.patch(
-        "app.api.v1.endpoints.admin.crud_user.get_users",
-        return_value=([], 0)
-    )
+    admin_stubs.get_users.return_value = ([], 0)
 
     # Act: Send request with invalid page
     response = await async_client.get("/api/v1/admin/users?page=0")